@@ -0,0 +1,128 @@
+"""
+Tests for the FMP response caches in the DCF analysis tool
+Run from adk-project/ with: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+import dcf_analysis_tool as dcf  # noqa: E402
+
+
+class _FakeResponse:
+    content = b'[{"symbol": "AAPL", "revenue": 100}]'
+
+    def raise_for_status(self):
+        pass
+
+
+class FMPCacheTests(unittest.TestCase):
+    def setUp(self):
+        dcf._CACHE.clear()
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patches = [
+            mock.patch.object(dcf, "_DISK_CACHE_DIR", cache_dir.name),
+            mock.patch.object(dcf, "_FMP_CONN", ("https://fmp.invalid/api/v3", "test-key")),
+            mock.patch.object(dcf._SESSION, "get", return_value=_FakeResponse()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_callers_params_are_not_modified(self):
+        params = {"symbol": "AAPL"}
+        dcf.make_fmp_request("income-statement", params)
+
+        self.assertEqual(params, {"symbol": "AAPL"})
+        self.assertEqual(dcf._SESSION.get.call_args.kwargs["params"]["apikey"], "test-key")
+
+    def test_reusing_params_hits_the_cache(self):
+        params = {"symbol": "AAPL"}
+        dcf.make_fmp_request("income-statement", params)
+        dcf.make_fmp_request("income-statement", params)
+
+        self.assertEqual(dcf._SESSION.get.call_count, 1)
+
+    def test_modifying_a_result_does_not_change_the_cache(self):
+        first = dcf.make_fmp_request("income-statement", {"symbol": "AAPL"})
+        first["data"][0]["revenue"] = 0
+        second = dcf.make_fmp_request("income-statement", {"symbol": "AAPL"})
+        second["data"].clear()
+        third = dcf.make_fmp_request("income-statement", {"symbol": "AAPL"})
+
+        self.assertEqual(third["data"], [{"symbol": "AAPL", "revenue": 100}])
+        self.assertEqual(dcf._SESSION.get.call_count, 1)
+
+
+
+class DiskCacheTests(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+        patches = [
+            mock.patch.object(dcf, "_DISK_CACHE_DIR", self.cache_dir),
+            mock.patch.object(dcf, "_DISK_CACHE_NEXT_PRUNE", 0.0),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _age(self, cache_key, seconds):
+        path = dcf._disk_cache_path(cache_key)
+        mtime = os.path.getmtime(path) - seconds
+        os.utime(path, (mtime, mtime))
+
+    def test_expired_entry_is_deleted_when_read(self):
+        dcf._disk_cache_set(("profile", ()), {"symbol": "AAPL"})
+        with mock.patch.object(dcf.time, "time", return_value=dcf.time.time() + dcf._DISK_CACHE_TTL_SECONDS + 1):
+            self.assertIsNone(dcf._disk_cache_get(("profile", ())))
+
+        self.assertFalse(os.path.exists(dcf._disk_cache_path(("profile", ()))))
+
+    def test_write_prunes_oldest_entries_down_to_the_byte_cap(self):
+        keys = [("income-statement", (("symbol", f"SYM{i}"),)) for i in range(5)]
+        for age, key in zip(range(50, 0, -10), keys):
+            dcf._disk_cache_set(key, ["x" * 1000])
+            self._age(key, age)
+        entry_size = os.path.getsize(dcf._disk_cache_path(keys[0]))
+
+        # Make the next write prune again. Room for three entries; the slack absorbs
+        # size differences in the serialized expiry
+        dcf._DISK_CACHE_NEXT_PRUNE = 0.0
+        with mock.patch.object(dcf, "_DISK_CACHE_MAX_BYTES", 3 * entry_size + entry_size // 2):
+            dcf._disk_cache_set(("profile", ()), ["x" * 1000])
+
+        remaining = [os.path.exists(dcf._disk_cache_path(key)) for key in keys]
+        self.assertEqual(remaining, [False, False, False, True, True])
+        self.assertTrue(os.path.exists(dcf._disk_cache_path(("profile", ()))))
+
+    def test_write_removes_expired_entries(self):
+        dcf._disk_cache_set(("old", ()), {"a": 1})
+        self._age(("old", ()), dcf._DISK_CACHE_TTL_SECONDS + 1)
+        dcf._DISK_CACHE_NEXT_PRUNE = 0.0
+        dcf._disk_cache_set(("new", ()), {"a": 2})
+
+        self.assertFalse(os.path.exists(dcf._disk_cache_path(("old", ()))))
+        self.assertEqual(dcf._disk_cache_get(("new", ())), {"a": 2})
+
+    def test_writes_within_the_interval_skip_the_directory_scan(self):
+        with mock.patch.object(dcf, "_disk_cache_prune", wraps=dcf._disk_cache_prune) as prune:
+            for i in range(3):
+                dcf._disk_cache_set(("profile", (("symbol", f"SYM{i}"),)), {"i": i})
+            self.assertEqual(prune.call_count, 1)
+
+            with mock.patch.object(dcf.time, "monotonic",
+                                   return_value=dcf.time.monotonic() + dcf._DISK_CACHE_PRUNE_INTERVAL_SECONDS):
+                dcf._disk_cache_set(("profile", ()), {})
+            self.assertEqual(prune.call_count, 2)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
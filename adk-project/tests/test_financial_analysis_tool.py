@@ -0,0 +1,117 @@
+"""
+Tests for the FMP request timeouts in the financial analysis tool
+Run from adk-project/ with: python -m unittest discover tests
+"""
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+import financial_analysis_tool as fat  # noqa: E402
+
+
+class _FMPHandler(BaseHTTPRequestHandler):
+    """Fake FMP API: /slow/* hangs, /unavailable/* answers 503, anything else returns one row"""
+
+    hits = {}
+    hang_seconds = 2.0
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        type(self).hits[path] = type(self).hits.get(path, 0) + 1
+
+        if path.startswith("/slow/"):
+            time.sleep(self.hang_seconds)
+            return
+        if path.startswith("/unavailable/"):
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps([{"symbol": "AAPL"}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FMPTimeoutTests(unittest.TestCase):
+    # Small enough to keep the tests fast, large enough to tell one attempt from several
+    READ_TIMEOUT = 0.5
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FMPHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+        # The fake server speaks plain HTTP; give it the same adapters (and retry policies) as FMP
+        cls._saved_adapters = []
+        for session in (fat._SESSION, fat._BEST_EFFORT_SESSION):
+            cls._saved_adapters.append((session, session.adapters["http://"]))
+            session.mount("http://", session.get_adapter("https://"))
+
+    @classmethod
+    def tearDownClass(cls):
+        for session, adapter in cls._saved_adapters:
+            session.mount("http://", adapter)
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _FMPHandler.hits.clear()
+        fat._CACHE.clear()
+        patches = [
+            mock.patch.object(fat, "_FMP_CONN", (f"{self.base_url}/slow", "test-key")),
+            mock.patch.object(fat, "_BEST_EFFORT_TIMEOUT", (1, self.READ_TIMEOUT)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_best_effort_endpoint_is_bounded_by_its_read_timeout(self):
+        started = time.monotonic()
+        results = fat._fetch_many([("ratios", {"symbol": "AAPL"})], best_effort=("ratios",))
+        elapsed = time.monotonic() - started
+
+        self.assertFalse(results["ratios"]["success"])
+        self.assertLess(elapsed, 2 * self.READ_TIMEOUT)
+        self.assertEqual(_FMPHandler.hits, {"/slow/ratios": 1})
+
+    def test_best_effort_endpoint_does_not_retry_server_errors(self):
+        with mock.patch.object(fat, "_FMP_CONN", (f"{self.base_url}/unavailable", "test-key")):
+            results = fat._fetch_many([("key-metrics", {"symbol": "AAPL"})], best_effort=("key-metrics",))
+
+        self.assertFalse(results["key-metrics"]["success"])
+        self.assertEqual(_FMPHandler.hits, {"/unavailable/key-metrics": 1})
+
+    def test_default_session_does_not_retry_read_timeouts(self):
+        result = fat.make_fmp_request("profile", {"symbol": "AAPL"}, timeout=(1, self.READ_TIMEOUT))
+
+        self.assertFalse(result["success"])
+        self.assertEqual(_FMPHandler.hits, {"/slow/profile": 1})
+
+    def test_critical_endpoints_still_succeed_alongside_best_effort_ones(self):
+        with mock.patch.object(fat, "_FMP_CONN", (f"{self.base_url}/ok", "test-key")):
+            results = fat._fetch_many(
+                [("profile", {"symbol": "AAPL"}), ("ratios", {"symbol": "AAPL"})],
+                best_effort=("ratios",)
+            )
+
+        self.assertTrue(results["profile"]["success"])
+        self.assertTrue(results["ratios"]["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Tests for the math tools
+Run from adk-project/ with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+import math_tool  # noqa: E402
+
+# @tool() wraps each function in a PythonTool; .fn is the plain function it registered
+compound_growth_schedule = math_tool.compound_growth_schedule.fn
+
+
+class CompoundGrowthScheduleTests(unittest.TestCase):
+    def test_zero_principal_returns_an_error(self):
+        result = compound_growth_schedule(0, [5, 7])
+
+        self.assertEqual(result, {
+            "operation": "compound_growth_schedule",
+            "error": "Principal cannot be zero"
+        })
+
+    def test_empty_schedule_returns_an_error(self):
+        result = compound_growth_schedule(100, [])
+
+        self.assertIn("error", result)
+
+    def test_trajectory_compounds_each_rate(self):
+        result = compound_growth_schedule(100, [10, -50])
+
+        self.assertEqual(result["periods"], 2)
+        self.assertAlmostEqual(result["trajectory"][0], 110)
+        self.assertAlmostEqual(result["final_value"], 55)
+        self.assertAlmostEqual(result["total_growth_percent"], -45)
+        self.assertEqual(result["formatted_final"], "$55.00")
+
+    def test_formatted_false_omits_formatted_strings(self):
+        result = compound_growth_schedule(100, [10], formatted=False)
+
+        self.assertNotIn("formatted_final", result)
+        self.assertNotIn("formatted_growth", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
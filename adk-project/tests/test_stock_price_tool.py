@@ -0,0 +1,92 @@
+"""
+Tests for symbol parsing and batched quotes in the stock price tool
+Run from adk-project/ with: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+import stock_price_tool as spt  # noqa: E402
+
+
+class _FakeResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class SplitSymbolsTests(unittest.TestCase):
+    def test_trims_around_each_symbol_and_skips_empty_ones(self):
+        self.assertEqual(spt._split_symbols(" AAPL, msft ,,\tGOOGL\n"), ["AAPL", "msft", "GOOGL"])
+
+    def test_keeps_inner_whitespace(self):
+        self.assertEqual(spt._split_symbols("BRK B, AAPL"), ["BRK B", "AAPL"])
+
+
+class ConnectionConfigTests(unittest.TestCase):
+    def setUp(self):
+        spt._reset_config()
+        self.addCleanup(spt._reset_config)
+        env = mock.patch.dict(os.environ, clear=False)
+        env.start()
+        self.addCleanup(env.stop)
+        for var in (spt._WXO_API_KEY_VAR, spt._WXO_BASE_URL_VAR, spt._FALLBACK_API_KEY_VAR):
+            os.environ.pop(var, None)
+
+    def test_missing_key_is_not_cached(self):
+        self.assertIsNone(spt.get_connection_config()["api_key"])
+
+        os.environ[spt._FALLBACK_API_KEY_VAR] = "late-key"
+        self.assertEqual(spt.get_connection_config()["api_key"], "late-key")
+
+    def test_config_is_cached_until_reset(self):
+        os.environ[spt._WXO_API_KEY_VAR] = "first-key"
+        self.assertEqual(spt.get_connection_config()["api_key"], "first-key")
+
+        os.environ[spt._WXO_API_KEY_VAR] = "second-key"
+        self.assertEqual(spt.get_connection_config()["api_key"], "first-key")
+
+        spt._reset_config()
+        self.assertEqual(spt.get_connection_config()["api_key"], "second-key")
+        self.assertEqual(spt.get_connection_config()["base_url"], spt._DEFAULT_BASE_URL)
+
+
+class QuotesBySymbolTests(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(spt, "_CONFIG", {"api_key": "test-key", "base_url": "https://fmp.invalid/api/v3"}),
+            mock.patch.object(
+                spt._SESSION, "get",
+                return_value=_FakeResponse(b'[{"symbol": "AAPL", "name": "Apple Inc.", "price": 1.0}]')
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_missing_symbol_error_echoes_the_callers_symbol(self):
+        results = spt._quotes_by_symbol(["aapl", "brk b"])
+
+        self.assertTrue(results["aapl"]["success"])
+        self.assertEqual(results["brk b"], {
+            "success": False,
+            "error": "No data found for symbol: brk b",
+            "symbol": "brk b"
+        })
+
+    def test_failed_batch_error_echoes_the_callers_symbol(self):
+        spt._SESSION.get.side_effect = spt.requests.exceptions.Timeout()
+        results = spt._quotes_by_symbol(["msft", "MSFT"])
+
+        self.assertEqual(results["msft"]["symbol"], "msft")
+        self.assertEqual(results["MSFT"]["symbol"], "MSFT")
+        self.assertFalse(results["msft"]["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,71 +2,225 @@
 DCF (Discounted Cash Flow) Analysis Tool
 Performs comprehensive DCF valuation analysis for companies using FMP API data
 """
-from typing import Dict, Any, Optional, List
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 from ibm_watsonx_orchestrate.run import connections
 from ibm_watsonx_orchestrate.agent_builder.connections import ConnectionType
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 
 FMP_APP_ID = 'fmp_financial_api'
 
+# Shared keep-alive session so TCP/TLS connections to FMP are reused across calls,
+# with a couple of backed-off retries for transient server errors
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+))
+
+# Long-lived worker pool for fanning out FMP requests, sized to the connection pool
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fmp")
+
+_FMP_CONN = None
+
+# TTL/LRU cache of successful FMP responses, keyed by (endpoint, sorted params)
+_CACHE_TTL_SECONDS = 300
+_CACHE_MAX_ENTRIES = 512
+_CACHE: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# Persistent cache so repeat analyses of a symbol survive process restarts.
+# Statements only change quarterly, so an hour is a safe freshness window.
+_DISK_CACHE_DIR = os.path.expanduser(os.getenv("FMP_CACHE_DIR", "~/.cache/finloggers/fmp"))
+_DISK_CACHE_TTL_SECONDS = 3600
+# Oldest entries are pruned once the directory grows past this many bytes
+_DISK_CACHE_MAX_BYTES = int(os.getenv("FMP_CACHE_MAX_BYTES", 100 * 1024 * 1024))
+# Pruning scans the whole directory, so writes run it at most this often
+_DISK_CACHE_PRUNE_INTERVAL_SECONDS = 60
+_DISK_CACHE_NEXT_PRUNE = 0.0
+_DISK_CACHE_PRUNE_LOCK = threading.Lock()
+
+
+def _get_conn() -> Tuple[str, str]:
+    """Resolve the FMP base URL and API key once per process"""
+    global _FMP_CONN
+    if _FMP_CONN is None:
+        conn = connections.api_key_auth(FMP_APP_ID)
+        _FMP_CONN = (conn.url.rstrip('/'), conn.api_key)
+    return _FMP_CONN
 
-def make_fmp_request(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Make a request to FMP API"""
+
+def _disk_cache_path(cache_key: Tuple) -> str:
+    digest = hashlib.sha256(repr(cache_key).encode("utf-8")).hexdigest()
+    return os.path.join(_DISK_CACHE_DIR, f"{digest}.json")
+
+
+def _disk_cache_get(cache_key: Tuple) -> Optional[Any]:
+    """Return cached data for the key if a fresh entry exists on disk, deleting it if expired"""
+    path = _disk_cache_path(cache_key)
     try:
-        conn = connections.api_key_auth(FMP_APP_ID)
-        base_url = conn.url
-        api_key = conn.api_key
-        base_url = base_url.rstrip('/')
+        with open(path, "rb") as f:
+            entry = _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if entry.get("expires", 0) <= time.time():
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return entry.get("data")
+
+
+def _disk_cache_prune() -> None:
+    """Delete expired entries, then the oldest ones until the cache fits _DISK_CACHE_MAX_BYTES"""
+    # Entries expire _DISK_CACHE_TTL_SECONDS after they were written, so mtime tells expiry
+    # without reading each file; leftover temp files from failed writes age out the same way
+    stale_before = time.time() - _DISK_CACHE_TTL_SECONDS
+    entries = []
+    with os.scandir(_DISK_CACHE_DIR) as it:
+        for entry in it:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if stat.st_mtime <= stale_before:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            elif entry.name.endswith(".json"):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= _DISK_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def _disk_cache_prune_if_due() -> None:
+    """Prune the disk cache at most once per _DISK_CACHE_PRUNE_INTERVAL_SECONDS"""
+    global _DISK_CACHE_NEXT_PRUNE
+    now = time.monotonic()
+    # Concurrent writers skip pruning instead of queueing behind a scan already under way
+    if now < _DISK_CACHE_NEXT_PRUNE or not _DISK_CACHE_PRUNE_LOCK.acquire(blocking=False):
+        return
+    try:
+        _DISK_CACHE_NEXT_PRUNE = now + _DISK_CACHE_PRUNE_INTERVAL_SECONDS
+        _disk_cache_prune()
+    finally:
+        _DISK_CACHE_PRUNE_LOCK.release()
+
+
+def _disk_cache_set(cache_key: Tuple, data: Any) -> None:
+    """Persist data for the key; the cache is best-effort and never fails a request"""
+    path = _disk_cache_path(cache_key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(_DISK_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires": time.time() + _DISK_CACHE_TTL_SECONDS, "data": data}, f)
+        os.replace(tmp_path, path)
+        _disk_cache_prune_if_due()
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _memory_cache_set(cache_key: Tuple, data: Any, now: float) -> None:
+    # Store a private copy so later changes to the caller's result can't reach the cache
+    data = copy.deepcopy(data)
+    with _CACHE_LOCK:
+        _CACHE[cache_key] = (now + _CACHE_TTL_SECONDS, data)
+        _CACHE.move_to_end(cache_key)
+        while len(_CACHE) > _CACHE_MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+
+
+def make_fmp_request(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Make a request to FMP API, serving repeated requests from the memory or disk cache"""
+    cache_key = (endpoint, tuple(sorted(params.items())))
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        cached = _CACHE.get(cache_key)
+        if cached is not None and cached[0] > now:
+            _CACHE.move_to_end(cache_key)
+        else:
+            cached = None
+    if cached is not None:
+        # Cached entries are never modified, so copy outside the lock; callers may change theirs
+        return {"success": True, "data": copy.deepcopy(cached[1])}
+
+    data = _disk_cache_get(cache_key)
+    if data is not None:
+        _memory_cache_set(cache_key, data, now)
+        return {"success": True, "data": data}
 
+    try:
+        base_url, api_key = _get_conn()
         url = f"{base_url}/{endpoint}"
-        params["apikey"] = api_key
+        # Copy rather than mutate the caller's params, which would also change their cache key
+        query = {**params, "apikey": api_key}
 
-        response = requests.get(url, params=params, timeout=15)
+        response = _SESSION.get(url, params=query, timeout=15)
         response.raise_for_status()
 
-        data = response.json()
-        return {"success": True, "data": data}
+        data = _json_loads(response.content)
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+    _memory_cache_set(cache_key, data, now)
+    _disk_cache_set(cache_key, data)
 
-@tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
-def calculate_wacc(
-    symbol: str,
-    risk_free_rate: Optional[float] = None,
-    equity_risk_premium: Optional[float] = 5.5
-) -> Dict[str, Any]:
-    """Calculate Weighted Average Cost of Capital (WACC) for a company.
-
-    Args:
-        symbol (str): Stock ticker symbol (e.g., "AAPL", "MSFT")
-        risk_free_rate (Optional[float]): Risk-free rate (e.g., 4.5%). If None, uses 10-year Treasury
-        equity_risk_premium (Optional[float]): Market risk premium (default 5.5%)
+    return {"success": True, "data": data}
 
-    Returns:
-        dict: WACC calculation with components (cost of equity, cost of debt, WACC %)
-    """
-    # Get key metrics for beta
-    metrics_result = make_fmp_request("key-metrics", {"symbol": symbol, "limit": 1})
-    if not metrics_result["success"]:
-        return {"error": f"Failed to get metrics: {metrics_result['error']}"}
 
-    # Get balance sheet for debt and equity values
-    balance_result = make_fmp_request("balance-sheet-statement", {"symbol": symbol, "limit": 1})
-    if not balance_result["success"]:
-        return {"error": f"Failed to get balance sheet: {balance_result['error']}"}
+def _fetch_many(requests_spec: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Issue several FMP requests concurrently, keyed by endpoint"""
+    try:
+        # Resolve credentials on the calling thread before fanning out
+        _get_conn()
+    except Exception as e:
+        return {endpoint: {"success": False, "error": str(e)} for endpoint, _ in requests_spec}
 
-    # Get income statement for tax rate
-    income_result = make_fmp_request("income-statement", {"symbol": symbol, "limit": 1})
-    if not income_result["success"]:
-        return {"error": f"Failed to get income statement: {income_result['error']}"}
+    futures = {
+        endpoint: _EXECUTOR.submit(make_fmp_request, endpoint, params)
+        for endpoint, params in requests_spec
+    }
+    return {endpoint: future.result() for endpoint, future in futures.items()}
 
-    metrics = metrics_result["data"][0] if metrics_result["data"] else {}
-    balance = balance_result["data"][0] if balance_result["data"] else {}
-    income = income_result["data"][0] if income_result["data"] else {}
 
+def _wacc_from_dicts(
+    symbol: str,
+    metrics: Dict[str, Any],
+    balance: Dict[str, Any],
+    income: Dict[str, Any],
+    risk_free_rate: Optional[float] = None,
+    equity_risk_premium: Optional[float] = 5.5
+) -> Dict[str, Any]:
+    """Compute WACC and its components from already-fetched statements"""
     # Extract values
     beta = metrics.get("beta", 1.0)
 
@@ -121,34 +275,65 @@ def calculate_wacc(
 
 
 @tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
-def perform_dcf_analysis(
+def calculate_wacc(
     symbol: str,
-    projection_years: int = 5,
-    fcf_growth_rate: Optional[float] = None,
-    terminal_growth_rate: float = 2.5,
-    discount_rate: Optional[float] = None,
-    margin_of_safety: float = 20.0
+    risk_free_rate: Optional[float] = None,
+    equity_risk_premium: Optional[float] = 5.5
 ) -> Dict[str, Any]:
-    """Perform comprehensive DCF (Discounted Cash Flow) valuation analysis.
+    """Calculate Weighted Average Cost of Capital (WACC) for a company.
 
     Args:
-        symbol (str): Stock ticker symbol (e.g., "AAPL", "MSFT", "TSLA")
-        projection_years (int): Number of years to project (default 5, max 10)
-        fcf_growth_rate (Optional[float]): Annual FCF growth rate %. If None, calculates from history
-        terminal_growth_rate (float): Perpetual growth rate after projection period (default 2.5%)
-        discount_rate (Optional[float]): WACC/discount rate %. If None, calculates automatically
-        margin_of_safety (float): Desired safety margin % (default 20%)
+        symbol (str): Stock ticker symbol (e.g., "AAPL", "MSFT")
+        risk_free_rate (Optional[float]): Risk-free rate (e.g., 4.5%). If None, uses 10-year Treasury
+        equity_risk_premium (Optional[float]): Market risk premium (default 5.5%)
 
     Returns:
-        dict: Complete DCF analysis with intrinsic value, current price, and recommendation
+        dict: WACC calculation with components (cost of equity, cost of debt, WACC %)
     """
-    # Validate inputs
-    projection_years = min(max(1, projection_years), 10)
-    terminal_growth_rate = min(max(0, terminal_growth_rate), 5)
-    margin_of_safety = min(max(0, margin_of_safety), 50)
+    # Fetch key metrics (beta), balance sheet (debt/equity) and income statement (tax rate) together
+    results = _fetch_many([
+        ("key-metrics", {"symbol": symbol, "limit": 1}),
+        ("balance-sheet-statement", {"symbol": symbol, "limit": 1}),
+        ("income-statement", {"symbol": symbol, "limit": 1}),
+    ])
+
+    metrics_result = results["key-metrics"]
+    if not metrics_result["success"]:
+        return {"error": f"Failed to get metrics: {metrics_result['error']}"}
+
+    balance_result = results["balance-sheet-statement"]
+    if not balance_result["success"]:
+        return {"error": f"Failed to get balance sheet: {balance_result['error']}"}
+
+    income_result = results["income-statement"]
+    if not income_result["success"]:
+        return {"error": f"Failed to get income statement: {income_result['error']}"}
+
+    metrics = metrics_result["data"][0] if metrics_result["data"] else {}
+    balance = balance_result["data"][0] if balance_result["data"] else {}
+    income = income_result["data"][0] if income_result["data"] else {}
+
+    return _wacc_from_dicts(symbol, metrics, balance, income, risk_free_rate, equity_risk_premium)
+
+
+def _fetch_dcf_inputs(symbol: str, include_income: bool = False) -> Dict[str, Any]:
+    """Fetch and validate the statements a DCF valuation needs.
+
+    With include_income, the latest income statement is fetched in the same batch
+    so WACC can be derived without refetching the balance sheet and key metrics.
+    """
+    # Fetch cash flows, balance sheet and key metrics together
+    requests_spec = [
+        ("cash-flow-statement", {"symbol": symbol, "limit": 5}),
+        ("balance-sheet-statement", {"symbol": symbol, "limit": 1}),
+        ("key-metrics", {"symbol": symbol, "limit": 1}),
+    ]
+    if include_income:
+        requests_spec.append(("income-statement", {"symbol": symbol, "limit": 1}))
+    results = _fetch_many(requests_spec)
 
     # 1. Get historical cash flow data
-    cf_result = make_fmp_request("cash-flow-statement", {"symbol": symbol, "limit": 5})
+    cf_result = results["cash-flow-statement"]
     if not cf_result["success"]:
         return {"error": f"Failed to get cash flows: {cf_result['error']}"}
 
@@ -157,60 +342,124 @@ def perform_dcf_analysis(
         return {"error": "Insufficient historical cash flow data"}
 
     # 2. Get balance sheet for debt and cash
-    balance_result = make_fmp_request("balance-sheet-statement", {"symbol": symbol, "limit": 1})
+    balance_result = results["balance-sheet-statement"]
     if not balance_result["success"]:
         return {"error": f"Failed to get balance sheet: {balance_result['error']}"}
 
     balance = balance_result["data"][0] if balance_result["data"] else {}
 
     # 3. Get key metrics for shares and current price
-    metrics_result = make_fmp_request("key-metrics", {"symbol": symbol, "limit": 1})
+    metrics_result = results["key-metrics"]
     if not metrics_result["success"]:
         return {"error": f"Failed to get metrics: {metrics_result['error']}"}
 
     metrics = metrics_result["data"][0] if metrics_result["data"] else {}
 
+    inputs = {"cash_flows": cash_flows, "balance": balance, "metrics": metrics}
+
+    if include_income:
+        income_result = results["income-statement"]
+        if income_result["success"]:
+            inputs["income"] = income_result["data"][0] if income_result["data"] else {}
+
+    return inputs
+
+
+def _historical_growth_rate(cash_flows: List[Dict[str, Any]]) -> float:
+    """FCF CAGR % over the available history, capped between -10% and 30%"""
+    historical_fcfs = [cf.get("freeCashFlow", 0) for cf in reversed(cash_flows)]
+    if len(historical_fcfs) < 2 or historical_fcfs[0] <= 0:
+        return 5.0  # Default conservative growth
+
+    first_fcf, last_fcf = historical_fcfs[0], historical_fcfs[-1]
+    if last_fcf <= 0:
+        return -10.0  # FCF collapsed; a fractional power of a non-positive ratio has no real CAGR
+
+    cagr = ((last_fcf / first_fcf) ** (1.0 / (len(historical_fcfs) - 1)) - 1.0) * 100
+    return min(max(cagr, -10.0), 30.0)  # Cap between -10% and 30%
+
+
+def _shares_outstanding(balance: Dict[str, Any], metrics: Dict[str, Any]) -> float:
+    """Share count from the balance sheet, falling back to key metrics"""
+    shares_outstanding = balance.get("commonStock", 0)
+    if shares_outstanding == 0:
+        shares_outstanding = metrics.get("sharesOutstanding", 1)
+    return shares_outstanding
+
+
+def _projection_kernel(latest_fcf: float, g: float, r: float, n: int) -> Tuple[float, float, float]:
+    """PV sum, final-year FCF and final discount factor for decimal rates g, r over n years"""
+    fcf = latest_fcf
+    disc = 1.0
+    growth = 1 + g
+    disc_step = 1 / (1 + r)
+    pv_sum = 0.0
+    for _ in range(n):
+        fcf *= growth
+        disc *= disc_step
+        pv_sum += fcf * disc
+    return pv_sum, fcf, disc
+
+
+def _intrinsic_value_kernel(
+    projection: Tuple[float, float, float],
+    total_debt: float,
+    cash: float,
+    shares: float,
+    tg: float,
+    r: float
+) -> float:
+    """Per-share intrinsic value given a projection from _projection_kernel and terminal growth tg"""
+    pv_sum, fcf, disc = projection
+    pv_sum += fcf * (1 + tg) / (r - tg) * disc
+    return (pv_sum - total_debt + cash) / shares if shares > 0 else 0
+
+
+def _dcf_compute(
+    symbol: str,
+    cash_flows: List[Dict[str, Any]],
+    balance: Dict[str, Any],
+    metrics: Dict[str, Any],
+    projection_years: int,
+    fcf_growth_rate: Optional[float],
+    terminal_growth_rate: float,
+    discount_rate: float,
+    margin_of_safety: float
+) -> Dict[str, Any]:
+    """Run the DCF valuation on already-fetched statements"""
+    # Validate inputs
+    projection_years = min(max(1, projection_years), 10)
+    terminal_growth_rate = min(max(0, terminal_growth_rate), 5)
+    margin_of_safety = min(max(0, margin_of_safety), 50)
+
     # Extract latest FCF
     latest_fcf = cash_flows[0].get("freeCashFlow", 0)
 
     # Calculate historical FCF growth rate if not provided
     if fcf_growth_rate is None:
-        historical_fcfs = [cf.get("freeCashFlow", 0) for cf in cash_flows[::-1]]
-        if len(historical_fcfs) >= 2 and historical_fcfs[0] > 0:
-            years = len(historical_fcfs) - 1
-            cagr = (pow(historical_fcfs[-1] / historical_fcfs[0], 1/years) - 1) * 100
-            fcf_growth_rate = min(max(cagr, -10), 30)  # Cap between -10% and 30%
-        else:
-            fcf_growth_rate = 5.0  # Default conservative growth
-
-    # Calculate discount rate (WACC) if not provided
-    if discount_rate is None:
-        wacc_result = calculate_wacc(symbol)
-        if "error" in wacc_result:
-            discount_rate = 10.0  # Default fallback
-        else:
-            discount_rate = wacc_result["wacc_percent"]
+        fcf_growth_rate = _historical_growth_rate(cash_flows)
 
-    # 4. Project future free cash flows
-    projected_fcfs = []
-    current_fcf = latest_fcf
+    # 4. Project future free cash flows, accumulating growth and discount factors per year
+    growth = 1 + fcf_growth_rate / 100
+    disc_step = 1 / (1 + discount_rate / 100)
+    projected_fcfs = []  # (year, fcf, present_value)
+    fcf = latest_fcf
+    disc = 1.0
+    pv_projected_fcfs = 0.0
 
     for year in range(1, projection_years + 1):
-        current_fcf = current_fcf * (1 + fcf_growth_rate / 100)
-        projected_fcfs.append({
-            "year": year,
-            "fcf": current_fcf,
-            "discount_factor": 1 / pow(1 + discount_rate / 100, year),
-            "present_value": current_fcf / pow(1 + discount_rate / 100, year)
-        })
+        fcf *= growth
+        disc *= disc_step
+        pv = fcf * disc
+        projected_fcfs.append((year, fcf, pv))
+        pv_projected_fcfs += pv
 
     # 5. Calculate terminal value
-    terminal_fcf = projected_fcfs[-1]["fcf"] * (1 + terminal_growth_rate / 100)
+    terminal_fcf = fcf * (1 + terminal_growth_rate / 100)
     terminal_value = terminal_fcf / ((discount_rate - terminal_growth_rate) / 100)
-    terminal_pv = terminal_value / pow(1 + discount_rate / 100, projection_years)
+    terminal_pv = terminal_value * disc
 
     # 6. Calculate enterprise value
-    pv_projected_fcfs = sum([fcf["present_value"] for fcf in projected_fcfs])
     enterprise_value = pv_projected_fcfs + terminal_pv
 
     # 7. Calculate equity value
@@ -219,9 +468,7 @@ def perform_dcf_analysis(
     equity_value = enterprise_value - total_debt + cash_and_equivalents
 
     # 8. Calculate intrinsic value per share
-    shares_outstanding = balance.get("commonStock", 0)
-    if shares_outstanding == 0:
-        shares_outstanding = metrics.get("sharesOutstanding", 1)
+    shares_outstanding = _shares_outstanding(balance, metrics)
 
     intrinsic_value_per_share = equity_value / shares_outstanding if shares_outstanding > 0 else 0
 
@@ -277,15 +524,62 @@ def perform_dcf_analysis(
         },
         "projected_cash_flows": [
             {
-                "year": fcf["year"],
-                "fcf": round(fcf["fcf"], 2),
-                "present_value": round(fcf["present_value"], 2)
+                "year": year,
+                "fcf": round(fcf, 2),
+                "present_value": round(pv, 2)
             }
-            for fcf in projected_fcfs
+            for year, fcf, pv in projected_fcfs
         ]
     }
 
 
+@tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
+def perform_dcf_analysis(
+    symbol: str,
+    projection_years: int = 5,
+    fcf_growth_rate: Optional[float] = None,
+    terminal_growth_rate: float = 2.5,
+    discount_rate: Optional[float] = None,
+    margin_of_safety: float = 20.0
+) -> Dict[str, Any]:
+    """Perform comprehensive DCF (Discounted Cash Flow) valuation analysis.
+
+    Args:
+        symbol (str): Stock ticker symbol (e.g., "AAPL", "MSFT", "TSLA")
+        projection_years (int): Number of years to project (default 5, max 10)
+        fcf_growth_rate (Optional[float]): Annual FCF growth rate %. If None, calculates from history
+        terminal_growth_rate (float): Perpetual growth rate after projection period (default 2.5%)
+        discount_rate (Optional[float]): WACC/discount rate %. If None, calculates automatically
+        margin_of_safety (float): Desired safety margin % (default 20%)
+
+    Returns:
+        dict: Complete DCF analysis with intrinsic value, current price, and recommendation
+    """
+    inputs = _fetch_dcf_inputs(symbol, include_income=discount_rate is None)
+    if "error" in inputs:
+        return inputs
+
+    # Calculate discount rate (WACC) from the fetched statements if not provided
+    if discount_rate is None:
+        if "income" in inputs:
+            wacc_result = _wacc_from_dicts(symbol, inputs["metrics"], inputs["balance"], inputs["income"])
+            discount_rate = wacc_result["wacc_percent"]
+        else:
+            discount_rate = 10.0  # Default fallback
+
+    return _dcf_compute(
+        symbol,
+        inputs["cash_flows"],
+        inputs["balance"],
+        inputs["metrics"],
+        projection_years,
+        fcf_growth_rate,
+        terminal_growth_rate,
+        discount_rate,
+        margin_of_safety
+    )
+
+
 @tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
 def dcf_sensitivity_analysis(
     symbol: str,
@@ -306,27 +600,40 @@ def dcf_sensitivity_analysis(
     Returns:
         dict: Sensitivity matrix showing intrinsic values for different assumptions
     """
+    # Statements are identical across the grid, so fetch them just once and bail out
+    # with a single error if that fails
+    inputs = _fetch_dcf_inputs(symbol)
+    if "error" in inputs:
+        return {"error": inputs["error"], "symbol": symbol}
+
+    cash_flows, balance, metrics = inputs["cash_flows"], inputs["balance"], inputs["metrics"]
+
+    # Validate and coerce inputs once for the whole grid; the kernels take decimal rates
+    years = int(min(max(1, projection_years), 10))
+    growth_rate = float(fcf_growth_rate) if fcf_growth_rate is not None else _historical_growth_rate(cash_flows)
+    g = growth_rate / 100
+    terminal_rates = [min(max(0.0, float(tg)), 5.0) / 100 for tg in terminal_growth_range]
+
+    latest_fcf = cash_flows[0].get("freeCashFlow", 0)
+    total_debt = balance.get("totalDebt", 0)
+    cash = balance.get("cashAndCashEquivalents", 0)
+    shares = _shares_outstanding(balance, metrics)
+
     results_matrix = []
 
     for discount_rate in discount_rate_range:
+        r = float(discount_rate) / 100
         row = {"discount_rate_percent": discount_rate, "values": []}
 
-        for terminal_growth in terminal_growth_range:
-            dcf_result = perform_dcf_analysis(
-                symbol=symbol,
-                projection_years=projection_years,
-                fcf_growth_rate=fcf_growth_rate,
-                terminal_growth_rate=terminal_growth,
-                discount_rate=discount_rate
-            )
-
-            if "error" in dcf_result:
-                row["values"].append({"terminal_growth_percent": terminal_growth, "intrinsic_value": None})
-            else:
-                row["values"].append({
-                    "terminal_growth_percent": terminal_growth,
-                    "intrinsic_value": dcf_result["valuation"]["intrinsic_value_per_share"]
-                })
+        # Only the terminal value depends on terminal growth, so project once per row
+        projection = _projection_kernel(latest_fcf, g, r, years)
+
+        for terminal_growth, tg in zip(terminal_growth_range, terminal_rates):
+            intrinsic_value = _intrinsic_value_kernel(projection, total_debt, cash, shares, tg, r)
+            row["values"].append({
+                "terminal_growth_percent": terminal_growth,
+                "intrinsic_value": round(intrinsic_value, 2)
+            })
 
         results_matrix.append(row)
 
@@ -334,12 +641,17 @@ def dcf_sensitivity_analysis(
     base_terminal = terminal_growth_range[len(terminal_growth_range) // 2]
     base_discount = discount_rate_range[len(discount_rate_range) // 2]
 
-    base_case = perform_dcf_analysis(
-        symbol=symbol,
-        projection_years=projection_years,
-        fcf_growth_rate=fcf_growth_rate,
-        terminal_growth_rate=base_terminal,
-        discount_rate=base_discount
+    # Reuse the fetched statements and resolved growth rate rather than re-running the tool
+    base_case = _dcf_compute(
+        symbol,
+        cash_flows,
+        balance,
+        metrics,
+        years,
+        growth_rate,
+        base_terminal,
+        base_discount,
+        20.0
     )
 
     return {
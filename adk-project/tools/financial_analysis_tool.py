@@ -3,51 +3,381 @@ Financial Analysis Tool - Comprehensive annual report analysis using FMP API
 Fetches income statements, balance sheets, cash flow, ratios, and key metrics
 Uses watsonx Orchestrate connection for secure credential management
 """
+import functools
 import os
+import threading
+import time
 import requests
-from typing import Dict, Any, List
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Tuple
 from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
 from ibm_watsonx_orchestrate.run import connections
 from ibm_watsonx_orchestrate.agent_builder.connections import ConnectionType, ExpectedCredentials
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
 
 # Connection app ID
 FMP_APP_ID = 'fmp_financial_api'
 
-
-def make_fmp_request(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+# (output key, FMP source key) projections for each statement endpoint
+_INCOME_FIELDS = (
+    ("date", "date"),
+    ("fiscal_year", "calendarYear"),
+    ("period", "period"),
+    ("revenue", "revenue"),
+    ("cost_of_revenue", "costOfRevenue"),
+    ("gross_profit", "grossProfit"),
+    ("gross_profit_ratio", "grossProfitRatio"),
+    ("operating_expenses", "operatingExpenses"),
+    ("operating_income", "operatingIncome"),
+    ("operating_income_ratio", "operatingIncomeRatio"),
+    ("net_income", "netIncome"),
+    ("net_income_ratio", "netIncomeRatio"),
+    ("eps", "eps"),
+    ("eps_diluted", "epsdiluted"),
+    ("ebitda", "ebitda"),
+    ("ebitda_ratio", "ebitdaratio"),
+)
+
+_BALANCE_FIELDS = (
+    ("date", "date"),
+    ("fiscal_year", "calendarYear"),
+    ("period", "period"),
+    ("cash_and_equivalents", "cashAndCashEquivalents"),
+    ("short_term_investments", "shortTermInvestments"),
+    ("total_current_assets", "totalCurrentAssets"),
+    ("total_assets", "totalAssets"),
+    ("total_current_liabilities", "totalCurrentLiabilities"),
+    ("total_liabilities", "totalLiabilities"),
+    ("short_term_debt", "shortTermDebt"),
+    ("long_term_debt", "longTermDebt"),
+    ("total_debt", "totalDebt"),
+    ("total_stockholders_equity", "totalStockholdersEquity"),
+    ("retained_earnings", "retainedEarnings"),
+    ("total_equity", "totalEquity"),
+)
+
+_CASH_FLOW_FIELDS = (
+    ("date", "date"),
+    ("fiscal_year", "calendarYear"),
+    ("period", "period"),
+    ("operating_cash_flow", "operatingCashFlow"),
+    ("capital_expenditure", "capitalExpenditure"),
+    ("free_cash_flow", "freeCashFlow"),
+    ("investing_cash_flow", "netCashUsedForInvestingActivites"),
+    ("financing_cash_flow", "netCashUsedProvidedByFinancingActivities"),
+    ("net_change_in_cash", "netChangeInCash"),
+    ("dividends_paid", "dividendsPaid"),
+    ("stock_repurchased", "commonStockRepurchased"),
+    ("debt_repayment", "debtRepayment"),
+)
+
+_KEY_METRICS_FIELDS = (
+    ("date", "date"),
+    ("fiscal_year", "calendarYear"),
+    ("period", "period"),
+    ("market_cap", "marketCap"),
+    ("pe_ratio", "peRatio"),
+    ("price_to_sales_ratio", "priceToSalesRatio"),
+    ("price_to_book_ratio", "pbRatio"),
+    ("ev_to_sales", "enterpriseValueOverEBITDA"),
+    ("revenue_per_share", "revenuePerShare"),
+    ("net_income_per_share", "netIncomePerShare"),
+    ("book_value_per_share", "bookValuePerShare"),
+    ("operating_cash_flow_per_share", "operatingCashFlowPerShare"),
+    ("free_cash_flow_per_share", "freeCashFlowPerShare"),
+    ("dividend_yield", "dividendYield"),
+    ("payout_ratio", "payoutRatio"),
+)
+
+# Thinner projections used by get_comprehensive_analysis
+_INCOME_SUMMARY_FIELDS = (
+    ("date", "date"),
+    ("fiscal_year", "calendarYear"),
+    ("revenue", "revenue"),
+    ("gross_profit", "grossProfit"),
+    ("operating_income", "operatingIncome"),
+    ("net_income", "netIncome"),
+    ("eps", "eps"),
+)
+
+_BALANCE_SUMMARY_FIELDS = (
+    ("date", "date"),
+    ("fiscal_year", "calendarYear"),
+    ("total_assets", "totalAssets"),
+    ("total_liabilities", "totalLiabilities"),
+    ("total_equity", "totalEquity"),
+    ("total_debt", "totalDebt"),
+)
+
+_CASH_FLOW_SUMMARY_FIELDS = (
+    ("date", "date"),
+    ("fiscal_year", "calendarYear"),
+    ("operating_cash_flow", "operatingCashFlow"),
+    ("free_cash_flow", "freeCashFlow"),
+)
+
+# Shared keep-alive session so requests reuse TCP/TLS connections to FMP,
+# retrying rate limits and transient server errors with a short backoff.
+# Read timeouts are not retried (read=0), so a call never waits longer than its read timeout.
+# DNS is only resolved when the pool opens a new connection, so warm calls skip it too.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, read=0, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Session for best-effort endpoints: no retries at all, so a request is bounded by its
+# own (connect, read) timeout and a slow or failing endpoint is given up on quickly
+_BEST_EFFORT_SESSION = requests.Session()
+_BEST_EFFORT_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=0)
+))
+
+# Long-lived worker pool for concurrent FMP requests, so callers don't pay thread start-up
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fmp")
+
+_FMP_CONN: Optional[Tuple[str, str]] = None  # (base_url, api_key)
+_FMP_CONN_LOCK = threading.Lock()
+
+
+# In-memory TTL cache of successful responses, keyed by (endpoint, sorted params).
+# Annual statements change at most quarterly, so they can be held much longer than profiles.
+# Expired entries that carry an ETag/Last-Modified validator are kept for conditional revalidation.
+# Entries hold the raw response body, which is far more compact than the parsed rows and is
+# re-parsed into fresh objects on every hit, so callers can never mutate a shared payload.
+_CACHE_TTL_SECONDS = {"profile": 3600}
+_DEFAULT_CACHE_TTL_SECONDS = 24 * 3600
+_CACHE_MAX_ENTRIES = 1024
+_CACHE: Dict[Tuple, Tuple[float, bytes, Optional[str], Optional[str]]] = {}  # (expires, body, etag, last_modified)
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key: Tuple) -> Tuple[Optional[Any], Optional[Dict[str, str]]]:
+    """Return (fresh data, None) on a hit, or (None, conditional headers) for a stale validated entry"""
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            return None, None
+        expires, body, etag, last_modified = entry
+        if expires > time.monotonic():
+            return _json_loads(body), None
+        if not (etag or last_modified):
+            del _CACHE[key]
+            return None, None
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return None, headers
+
+
+def _cache_set(
+    key: Tuple,
+    endpoint: str,
+    body: bytes,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None
+) -> None:
+    ttl = _CACHE_TTL_SECONDS.get(endpoint, _DEFAULT_CACHE_TTL_SECONDS)
+    with _CACHE_LOCK:
+        if key not in _CACHE and len(_CACHE) >= _CACHE_MAX_ENTRIES:
+            # Evict the entry closest to expiry
+            del _CACHE[min(_CACHE, key=lambda k: _CACHE[k][0])]
+        _CACHE[key] = (time.monotonic() + ttl, body, etag, last_modified)
+
+
+def _cache_revalidated(key: Tuple, endpoint: str) -> Optional[Any]:
+    """Extend a stale entry after a 304 Not Modified and return its parsed data"""
+    ttl = _CACHE_TTL_SECONDS.get(endpoint, _DEFAULT_CACHE_TTL_SECONDS)
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            return None
+        _CACHE[key] = (time.monotonic() + ttl,) + entry[1:]
+    return _json_loads(entry[1])
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_projection(fields: Tuple[Tuple[str, str], ...]):
+    """Split field pairs into output keys and a C-level getter for the source keys"""
+    return tuple(key for key, _ in fields), itemgetter(*(source for _, source in fields))
+
+
+def _project_rows(rows: List[Dict[str, Any]], fields: Tuple[Tuple[str, str], ...]) -> List[Dict[str, Any]]:
+    """Project raw FMP rows onto (output key, source key) field pairs.
+
+    Rows are built as plain dicts because they are the tool's JSON response as-is;
+    an intermediate dataclass would only add an asdict() pass before returning.
+    """
+    out_keys, getter = _compile_projection(fields)
+    projected = []
+    for row in rows:
+        try:
+            projected.append(dict(zip(out_keys, getter(row))))
+        except KeyError:
+            # FMP omits some fields on older filings; fall back to per-key lookups
+            projected.append({key: row.get(source) for key, source in fields})
+    return projected
+
+
+def _get_conn() -> Tuple[str, str]:
+    """Resolve the FMP connection once per process into a normalized (base_url, api_key) pair"""
+    global _FMP_CONN
+    if _FMP_CONN is None:
+        with _FMP_CONN_LOCK:
+            if _FMP_CONN is None:
+                conn = connections.api_key_auth(FMP_APP_ID)
+                _FMP_CONN = (conn.url.rstrip('/'), conn.api_key)
+    return _FMP_CONN
+
+
+# (connect, read) timeouts in seconds
+_DEFAULT_TIMEOUT = (3, 15)
+_BEST_EFFORT_TIMEOUT = (3, 8)
+
+
+def make_fmp_request(
+    endpoint: str,
+    params: Dict[str, Any],
+    conn: Optional[Tuple[str, str]] = None,
+    timeout: Tuple[float, float] = _DEFAULT_TIMEOUT,
+    session: requests.Session = _SESSION
+) -> Dict[str, Any]:
     """
     Helper function to make FMP API requests using Watson Orchestrate connection.
 
     Args:
         endpoint: API endpoint (e.g., 'profile', 'income-statement')
         params: Query parameters (e.g., {'symbol': 'AAPL'})
+        conn: Already-resolved (base_url, api_key); looked up when not provided
+        timeout: (connect, read) timeout in seconds
+        session: Session to send the request with; _BEST_EFFORT_SESSION never retries
 
     Returns:
         dict: API response data or error
     """
-    conn = connections.api_key_auth(FMP_APP_ID)
-    base_url = conn.url
-    api_key = conn.api_key
-    base_url = base_url.rstrip('/')
+    cache_key = (endpoint, tuple(sorted(params.items())))
+    cached, conditional_headers = _cache_get(cache_key)
+    if cached is not None:
+        return {"success": True, "data": cached}
+
+    base_url, api_key = conn or _get_conn()
 
     try:
         url = f"{base_url}/{endpoint}"
-        params["apikey"] = api_key
+        # Copy rather than mutate the caller's params so the API key never leaks into them
+        query = {**params, "apikey": api_key}
+
+        response = session.get(url, params=query, headers=conditional_headers, timeout=timeout)
+
+        # Unchanged since the cached copy: skip the body and JSON parse entirely
+        if response.status_code == 304:
+            data = _cache_revalidated(cache_key, endpoint)
+            if data is not None:
+                return {"success": True, "data": data}
+            response = session.get(url, params=query, timeout=timeout)
 
-        response = requests.get(url, params=params, timeout=15)
         response.raise_for_status()
-        data = response.json()
+        data = _json_loads(response.content)
 
         if not data:
             return {"success": False, "error": "No data returned from API"}
 
+        _cache_set(
+            cache_key,
+            endpoint,
+            response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
         return {"success": True, "data": data}
 
     except Exception as e:
         return {"success": False, "error": f"API request failed: {str(e)}"}
 
 
+def _fetch_many(
+    requests_spec: List[Tuple[str, Dict[str, Any]]],
+    best_effort: Tuple[str, ...] = ()
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Issue several FMP requests at once, resolving the connection a single time.
+
+    Args:
+        requests_spec: (endpoint, params) pairs to fetch
+        best_effort: Endpoints fetched with _BEST_EFFORT_TIMEOUT and no retries
+
+    Returns:
+        dict: make_fmp_request results keyed by endpoint
+    """
+    conn = _get_conn()
+
+    futures = {}
+    for endpoint, params in requests_spec:
+        if endpoint in best_effort:
+            timeout, session = _BEST_EFFORT_TIMEOUT, _BEST_EFFORT_SESSION
+        else:
+            timeout, session = _DEFAULT_TIMEOUT, _SESSION
+        futures[endpoint] = _EXECUTOR.submit(make_fmp_request, endpoint, params, conn, timeout, session)
+    return {endpoint: future.result() for endpoint, future in futures.items()}
+
+
+# kind -> (FMP endpoint, field projection or None for raw rows, response key)
+_STATEMENT_SPECS = {
+    "income": ("income-statement", _INCOME_FIELDS, "statements"),
+    "balance": ("balance-sheet-statement", _BALANCE_FIELDS, "statements"),
+    "cash_flow": ("cash-flow-statement", _CASH_FLOW_FIELDS, "statements"),
+    "ratios": ("ratios", None, "ratios"),
+    "key_metrics": ("key-metrics", _KEY_METRICS_FIELDS, "metrics"),
+}
+
+
+def _statement_tool(kind: str, symbol: str, period: str, limit: int) -> Dict[str, Any]:
+    """
+    Shared fetch/validate/project path behind the per-statement tools.
+
+    Args:
+        kind: Key into _STATEMENT_SPECS (e.g., 'income', 'ratios')
+        symbol: Stock ticker symbol
+        period: 'annual' or 'quarter'
+        limit: Number of periods to retrieve
+
+    Returns:
+        dict: Tool response with the projected rows, or the request error
+    """
+    endpoint, fields, response_key = _STATEMENT_SPECS[kind]
+    result = make_fmp_request(endpoint, {"symbol": symbol.upper(), "period": period, "limit": limit})
+
+    if not result["success"]:
+        result["symbol"] = symbol
+        return result
+
+    rows = _project_rows(result["data"], fields) if fields is not None else [result["data"]]
+
+    return {
+        "success": True,
+        "symbol": symbol,
+        "period": period,
+        "count": len(rows),
+        response_key: rows
+    }
+
+
 @tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
 def get_company_profile(symbol: str) -> Dict[str, Any]:
     """Get comprehensive company profile including basic information and current metrics.
@@ -99,43 +429,7 @@ def get_income_statement(symbol: str, period: str = "annual", limit: int = 5) ->
     Returns:
         dict: Income statement data including revenue, gross profit, operating income, net income, EPS
     """
-    result = make_fmp_request(
-        "income-statement",
-        {"symbol": symbol.upper(), "period": period, "limit": limit}
-    )
-
-    if not result["success"]:
-        result["symbol"] = symbol
-        return result
-
-    statements = []
-    for stmt in result["data"]:
-        statements.append({
-            "date": stmt.get("date"),
-            "fiscal_year": stmt.get("calendarYear"),
-            "period": stmt.get("period"),
-            "revenue": stmt.get("revenue"),
-            "cost_of_revenue": stmt.get("costOfRevenue"),
-            "gross_profit": stmt.get("grossProfit"),
-            "gross_profit_ratio": stmt.get("grossProfitRatio"),
-            "operating_expenses": stmt.get("operatingExpenses"),
-            "operating_income": stmt.get("operatingIncome"),
-            "operating_income_ratio": stmt.get("operatingIncomeRatio"),
-            "net_income": stmt.get("netIncome"),
-            "net_income_ratio": stmt.get("netIncomeRatio"),
-            "eps": stmt.get("eps"),
-            "eps_diluted": stmt.get("epsdiluted"),
-            "ebitda": stmt.get("ebitda"),
-            "ebitda_ratio": stmt.get("ebitdaratio")
-        })
-
-    return {
-        "success": True,
-        "symbol": symbol,
-        "period": period,
-        "count": len(statements),
-        "statements": statements
-    }
+    return _statement_tool("income", symbol, period, limit)
 
 
 @tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
@@ -150,42 +444,7 @@ def get_balance_sheet(symbol: str, period: str = "annual", limit: int = 5) -> Di
     Returns:
         dict: Balance sheet data including total assets, liabilities, equity, cash, debt
     """
-    result = make_fmp_request(
-        "balance-sheet-statement",
-        {"symbol": symbol.upper(), "period": period, "limit": limit}
-    )
-
-    if not result["success"]:
-        result["symbol"] = symbol
-        return result
-
-    statements = []
-    for stmt in result["data"]:
-        statements.append({
-            "date": stmt.get("date"),
-            "fiscal_year": stmt.get("calendarYear"),
-            "period": stmt.get("period"),
-            "cash_and_equivalents": stmt.get("cashAndCashEquivalents"),
-            "short_term_investments": stmt.get("shortTermInvestments"),
-            "total_current_assets": stmt.get("totalCurrentAssets"),
-            "total_assets": stmt.get("totalAssets"),
-            "total_current_liabilities": stmt.get("totalCurrentLiabilities"),
-            "total_liabilities": stmt.get("totalLiabilities"),
-            "short_term_debt": stmt.get("shortTermDebt"),
-            "long_term_debt": stmt.get("longTermDebt"),
-            "total_debt": stmt.get("totalDebt"),
-            "total_stockholders_equity": stmt.get("totalStockholdersEquity"),
-            "retained_earnings": stmt.get("retainedEarnings"),
-            "total_equity": stmt.get("totalEquity")
-        })
-
-    return {
-        "success": True,
-        "symbol": symbol,
-        "period": period,
-        "count": len(statements),
-        "statements": statements
-    }
+    return _statement_tool("balance", symbol, period, limit)
 
 
 @tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
@@ -200,39 +459,7 @@ def get_cash_flow_statement(symbol: str, period: str = "annual", limit: int = 5)
     Returns:
         dict: Cash flow data including operating cash flow, investing activities, financing activities, free cash flow
     """
-    result = make_fmp_request(
-        "cash-flow-statement",
-        {"symbol": symbol.upper(), "period": period, "limit": limit}
-    )
-
-    if not result["success"]:
-        result["symbol"] = symbol
-        return result
-
-    statements = []
-    for stmt in result["data"]:
-        statements.append({
-            "date": stmt.get("date"),
-            "fiscal_year": stmt.get("calendarYear"),
-            "period": stmt.get("period"),
-            "operating_cash_flow": stmt.get("operatingCashFlow"),
-            "capital_expenditure": stmt.get("capitalExpenditure"),
-            "free_cash_flow": stmt.get("freeCashFlow"),
-            "investing_cash_flow": stmt.get("netCashUsedForInvestingActivites"),
-            "financing_cash_flow": stmt.get("netCashUsedProvidedByFinancingActivities"),
-            "net_change_in_cash": stmt.get("netChangeInCash"),
-            "dividends_paid": stmt.get("dividendsPaid"),
-            "stock_repurchased": stmt.get("commonStockRepurchased"),
-            "debt_repayment": stmt.get("debtRepayment")
-        })
-
-    return {
-        "success": True,
-        "symbol": symbol,
-        "period": period,
-        "count": len(statements),
-        "statements": statements
-    }
+    return _statement_tool("cash_flow", symbol, period, limit)
 
 
 @tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
@@ -247,17 +474,7 @@ def get_financial_ratios(symbol: str, period: str = "annual", limit: int = 5) ->
     Returns:
         dict: Financial ratios including ROE, ROA, current ratio, debt ratios, profit margins
     """
-    result = make_fmp_request(
-        "ratios",
-        {"symbol": symbol.upper(), "period": period, "limit": limit}
-    )
-
-    if not result["success"]:
-        result["symbol"] = symbol
-        return result
-
-    ratios = []
-    ratios.append(result["data"])
+    # Ratio rows are returned raw; a field projection for them would look like:
     # for ratio in result["data"]:
     #     ratios.append({
     #         "date": ratio.get("date"),
@@ -295,14 +512,7 @@ def get_financial_ratios(symbol: str, period: str = "annual", limit: int = 5) ->
     #         "operatingCashFlowSalesRatio": ratio.get("operatingCashFlowSalesRatio"),
     #         "freeCashFlowOperatingCashFlowRatio": ratio.get("freeCashFlowOperatingCashFlowRatio")
     #     })
-
-    return {
-        "success": True,
-        "symbol": symbol,
-        "period": period,
-        "count": len(ratios),
-        "ratios": ratios
-    }
+    return _statement_tool("ratios", symbol, period, limit)
 
 
 @tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
@@ -317,42 +527,33 @@ def get_key_metrics(symbol: str, period: str = "annual", limit: int = 5) -> Dict
     Returns:
         dict: Key metrics including market cap, P/E ratio, revenue per share, book value, dividends
     """
-    result = make_fmp_request(
-        "key-metrics",
-        {"symbol": symbol.upper(), "period": period, "limit": limit}
-    )
+    return _statement_tool("key_metrics", symbol, period, limit)
 
-    if not result["success"]:
-        result["symbol"] = symbol
-        return result
 
-    metrics = []
-    for metric in result["data"]:
-        metrics.append({
-            "date": metric.get("date"),
-            "fiscal_year": metric.get("calendarYear"),
-            "period": metric.get("period"),
-            "market_cap": metric.get("marketCap"),
-            "pe_ratio": metric.get("peRatio"),
-            "price_to_sales_ratio": metric.get("priceToSalesRatio"),
-            "price_to_book_ratio": metric.get("pbRatio"),
-            "ev_to_sales": metric.get("enterpriseValueOverEBITDA"),
-            "revenue_per_share": metric.get("revenuePerShare"),
-            "net_income_per_share": metric.get("netIncomePerShare"),
-            "book_value_per_share": metric.get("bookValuePerShare"),
-            "operating_cash_flow_per_share": metric.get("operatingCashFlowPerShare"),
-            "free_cash_flow_per_share": metric.get("freeCashFlowPerShare"),
-            "dividend_yield": metric.get("dividendYield"),
-            "payout_ratio": metric.get("payoutRatio")
-        })
+# (FMP endpoint, label) pairs checked by get_comprehensive_analysis
+_CRITICAL_ENDPOINTS = (
+    ("profile", "Profile"),
+    ("income-statement", "Income Statement"),
+    ("balance-sheet-statement", "Balance Sheet"),
+    ("cash-flow-statement", "Cash Flow"),
+)
+
+_BEST_EFFORT_ENDPOINTS = (
+    ("ratios", "Financial Ratios"),
+    ("key-metrics", "Key Metrics"),
+)
 
-    return {
-        "success": True,
-        "symbol": symbol,
-        "period": period,
-        "count": len(metrics),
-        "metrics": metrics
-    }
+
+def _collect_failures(
+    results: Dict[str, Dict[str, Any]],
+    endpoints: Tuple[Tuple[str, str], ...]
+) -> List[str]:
+    """Return "label: error" messages for the endpoints whose request failed"""
+    return [
+        f"{label}: {results[endpoint].get('error')}"
+        for endpoint, label in endpoints
+        if not results[endpoint]["success"]
+    ]
 
 
 @tool(expected_credentials=[{"app_id": FMP_APP_ID, "type": ConnectionType.API_KEY_AUTH}])
@@ -377,29 +578,21 @@ def get_comprehensive_analysis(symbol: str, years: int = 3) -> Dict[str, Any]:
     symbol = symbol.upper()
     years = min(years, 10)  # Cap at 10 years
 
-    # Make API requests directly instead of calling other tool functions
-    profile_result = make_fmp_request("profile", {"symbol": symbol})
-    income_result = make_fmp_request(
-        "income-statement", {"symbol": symbol, "period": "annual", "limit": years})
-    balance_result = make_fmp_request(
-        "balance-sheet-statement", {"symbol": symbol, "period": "annual", "limit": years})
-    cash_flow_result = make_fmp_request(
-        "cash-flow-statement", {"symbol": symbol, "period": "annual", "limit": years})
-    ratios_result = make_fmp_request(
-        "ratios", {"symbol": symbol, "period": "annual", "limit": years})
-    metrics_result = make_fmp_request(
-        "key-metrics", {"symbol": symbol, "period": "annual", "limit": years})
-
+    # Make API requests directly instead of calling other tool functions, all six in parallel
+    results = _fetch_many([
+        ("profile", {"symbol": symbol}),
+        ("income-statement", {"symbol": symbol, "period": "annual", "limit": years}),
+        ("balance-sheet-statement", {"symbol": symbol, "period": "annual", "limit": years}),
+        ("cash-flow-statement", {"symbol": symbol, "period": "annual", "limit": years}),
+        ("ratios", {"symbol": symbol, "period": "annual", "limit": years}),
+        ("key-metrics", {"symbol": symbol, "period": "annual", "limit": years}),
+    ], best_effort=(
+        # Ratios and metrics are supplementary, so don't let a slow endpoint hold up the response
+        "ratios",
+        "key-metrics",
+    ))
     # Check if any critical data failed
-    failures = []
-    if not profile_result.get("success"):
-        failures.append(f"Profile: {profile_result.get('error')}")
-    if not income_result.get("success"):
-        failures.append(f"Income Statement: {income_result.get('error')}")
-    if not balance_result.get("success"):
-        failures.append(f"Balance Sheet: {balance_result.get('error')}")
-    if not cash_flow_result.get("success"):
-        failures.append(f"Cash Flow: {cash_flow_result.get('error')}")
+    failures = _collect_failures(results, _CRITICAL_ENDPOINTS)
 
     if failures:
         return {
@@ -409,46 +602,30 @@ def get_comprehensive_analysis(symbol: str, years: int = 3) -> Dict[str, Any]:
             "failures": failures
         }
 
+    # Ratios and metrics are best-effort; report their failures without failing the analysis
+    warnings = _collect_failures(results, _BEST_EFFORT_ENDPOINTS)
+
+    profile_result = results["profile"]
+    income_result = results["income-statement"]
+    balance_result = results["balance-sheet-statement"]
+    cash_flow_result = results["cash-flow-statement"]
+    ratios_result = results["ratios"]
+    metrics_result = results["key-metrics"]
+
     # Extract profile data
     profile_data = profile_result["data"][0] if isinstance(
         profile_result["data"], list) else profile_result["data"]
 
     # Process income statements
-    income_statements = []
-    for stmt in income_result.get("data", []):
-        income_statements.append({
-            "date": stmt.get("date"),
-            "fiscal_year": stmt.get("calendarYear"),
-            "revenue": stmt.get("revenue"),
-            "gross_profit": stmt.get("grossProfit"),
-            "operating_income": stmt.get("operatingIncome"),
-            "net_income": stmt.get("netIncome"),
-            "eps": stmt.get("eps")
-        })
+    income_statements = _project_rows(income_result.get("data", []), _INCOME_SUMMARY_FIELDS)
 
     # Process balance sheets
-    balance_sheets = []
-    for stmt in balance_result.get("data", []):
-        balance_sheets.append({
-            "date": stmt.get("date"),
-            "fiscal_year": stmt.get("calendarYear"),
-            "total_assets": stmt.get("totalAssets"),
-            "total_liabilities": stmt.get("totalLiabilities"),
-            "total_equity": stmt.get("totalEquity"),
-            "total_debt": stmt.get("totalDebt")
-        })
+    balance_sheets = _project_rows(balance_result.get("data", []), _BALANCE_SUMMARY_FIELDS)
 
     # Process cash flows
-    cash_flows = []
-    for stmt in cash_flow_result.get("data", []):
-        cash_flows.append({
-            "date": stmt.get("date"),
-            "fiscal_year": stmt.get("calendarYear"),
-            "operating_cash_flow": stmt.get("operatingCashFlow"),
-            "free_cash_flow": stmt.get("freeCashFlow")
-        })
+    cash_flows = _project_rows(cash_flow_result.get("data", []), _CASH_FLOW_SUMMARY_FIELDS)
 
-    return {
+    analysis = {
         "success": True,
         "symbol": symbol,
         "analysis_period_years": years,
@@ -475,3 +652,8 @@ def get_comprehensive_analysis(symbol: str, years: int = 3) -> Dict[str, Any]:
             "latest_fiscal_year": income_statements[0].get("fiscal_year") if income_statements else None
         }
     }
+
+    if warnings:
+        analysis["warnings"] = warnings
+
+    return analysis
@@ -2,6 +2,8 @@
 Math Tool - Basic arithmetic operations for financial calculations
 Provides addition, subtraction, multiplication, division, percentage, and compound calculations
 """
+import operator
+from itertools import accumulate
 from typing import Union, List
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
@@ -90,32 +92,36 @@ def divide(a: float, b: float) -> dict:
 
 
 @tool()
-def percentage(value: float, percent: float) -> dict:
+def percentage(value: float, percent: float, formatted: bool = True) -> dict:
     """Calculate percentage of a value.
 
     Args:
         value (float): The base value
         percent (float): The percentage (e.g., 15 for 15%)
+        formatted (bool): Include human-readable formatted strings in the result (default True)
 
     Returns:
         dict: Result of (value × percent / 100)
     """
     result = (value * percent) / 100
-    return {
+    response = {
         "operation": "percentage",
         "expression": f"{percent}% of {value}",
-        "result": result,
-        "formatted": f"{result:.2f}"
+        "result": result
     }
+    if formatted:
+        response["formatted"] = f"{result:.2f}"
+    return response
 
 
 @tool()
-def percentage_change(old_value: float, new_value: float) -> dict:
+def percentage_change(old_value: float, new_value: float, formatted: bool = True) -> dict:
     """Calculate percentage change between two values.
 
     Args:
         old_value (float): Original value
         new_value (float): New value
+        formatted (bool): Include human-readable formatted strings in the result (default True)
 
     Returns:
         dict: Percentage change ((new - old) / old × 100)
@@ -129,23 +135,58 @@ def percentage_change(old_value: float, new_value: float) -> dict:
     change = new_value - old_value
     percent_change = (change / old_value) * 100
 
-    return {
+    response = {
         "operation": "percentage_change",
         "old_value": old_value,
         "new_value": new_value,
         "absolute_change": change,
         "percentage_change": percent_change,
-        "formatted": f"{percent_change:+.2f}%",
         "direction": "increase" if percent_change > 0 else "decrease" if percent_change < 0 else "no change"
     }
+    if formatted:
+        response["formatted"] = f"{percent_change:+.2f}%"
+    return response
 
 
 @tool()
-def average(numbers: List[float]) -> dict:
+def percentage_change_batch(old_values: List[float], new_values: List[float]) -> dict:
+    """Calculate percentage changes for paired lists of values in one call.
+
+    Args:
+        old_values (List[float]): Original values (e.g., revenue for each prior year)
+        new_values (List[float]): New values, paired by position with old_values
+
+    Returns:
+        dict: Percentage change for each pair; pairs with a zero original value are None
+    """
+    if len(old_values) != len(new_values):
+        return {
+            "operation": "percentage_change_batch",
+            "error": "old_values and new_values must have the same length"
+        }
+
+    # One tool call for the whole series instead of one per pair; a zero base has no
+    # defined change, so it is reported as None rather than NaN (not valid JSON)
+    values = [
+        (new - old) / old * 100 if old != 0 else None
+        for old, new in zip(old_values, new_values)
+    ]
+
+    return {
+        "operation": "percentage_change_batch",
+        "count": len(values),
+        "values": values,
+        "undefined_indices": [i for i, value in enumerate(values) if value is None]
+    }
+
+
+@tool()
+def average(numbers: List[float], formatted: bool = True) -> dict:
     """Calculate the average (mean) of a list of numbers.
 
     Args:
         numbers (List[float]): List of numbers to average
+        formatted (bool): Include human-readable formatted strings in the result (default True)
 
     Returns:
         dict: Average of the numbers
@@ -156,28 +197,33 @@ def average(numbers: List[float]) -> dict:
             "error": "Cannot calculate average of empty list"
         }
 
+    # The builtin sum already reduces a float list in C; building a NumPy array from
+    # the JSON-decoded list would cost more than the reduction it replaces
     total = sum(numbers)
     count = len(numbers)
     avg = total / count
 
-    return {
+    response = {
         "operation": "average",
         "numbers": numbers,
         "count": count,
         "sum": total,
-        "average": avg,
-        "formatted": f"{avg:.2f}"
+        "average": avg
     }
+    if formatted:
+        response["formatted"] = f"{avg:.2f}"
+    return response
 
 
 @tool()
-def compound_growth(principal: float, rate: float, periods: int) -> dict:
+def compound_growth(principal: float, rate: float, periods: int, formatted: bool = True) -> dict:
     """Calculate compound growth (compound interest formula).
 
     Args:
         principal (float): Initial value
         rate (float): Growth rate per period as percentage (e.g., 5 for 5%)
         periods (int): Number of periods
+        formatted (bool): Include human-readable formatted strings in the result (default True)
 
     Returns:
         dict: Final value using A = P(1 + r)^n
@@ -193,26 +239,78 @@ def compound_growth(principal: float, rate: float, periods: int) -> dict:
     total_growth = final_value - principal
     total_growth_percent = (total_growth / principal) * 100
 
-    return {
+    response = {
         "operation": "compound_growth",
         "principal": principal,
         "rate_percent": rate,
         "periods": periods,
         "final_value": final_value,
         "total_growth": total_growth,
-        "total_growth_percent": total_growth_percent,
-        "formatted_final": f"${final_value:,.2f}",
-        "formatted_growth": f"${total_growth:,.2f} ({total_growth_percent:.2f}%)"
+        "total_growth_percent": total_growth_percent
+    }
+    if formatted:
+        response["formatted_final"] = f"${final_value:,.2f}"
+        response["formatted_growth"] = f"${total_growth:,.2f} ({total_growth_percent:.2f}%)"
+    return response
+
+
+@tool()
+def compound_growth_schedule(principal: float, rates: List[float], formatted: bool = True) -> dict:
+    """Calculate compound growth over a schedule of per-period growth rates.
+
+    Args:
+        principal (float): Initial value
+        rates (List[float]): Growth rate for each period as percentage (e.g., [5, 7, 4])
+        formatted (bool): Include human-readable formatted strings in the result (default True)
+
+    Returns:
+        dict: Value after each period and the final value using A = P(1 + r1)(1 + r2)...(1 + rn)
+    """
+    if not rates:
+        return {
+            "operation": "compound_growth_schedule",
+            "error": "Rate schedule must contain at least one period"
+        }
+    if principal == 0:
+        return {
+            "operation": "compound_growth_schedule",
+            "error": "Principal cannot be zero"
+        }
+
+    # Running product in one pass; each entry is the value at the end of that period
+    trajectory = list(accumulate(
+        (1 + rate / 100 for rate in rates),
+        operator.mul,
+        initial=principal
+    ))[1:]
+    final_value = trajectory[-1]
+    total_growth = final_value - principal
+    total_growth_percent = (total_growth / principal) * 100
+
+    response = {
+        "operation": "compound_growth_schedule",
+        "principal": principal,
+        "rates_percent": rates,
+        "periods": len(rates),
+        "trajectory": trajectory,
+        "final_value": final_value,
+        "total_growth": total_growth,
+        "total_growth_percent": total_growth_percent
     }
+    if formatted:
+        response["formatted_final"] = f"${final_value:,.2f}"
+        response["formatted_growth"] = f"${total_growth:,.2f} ({total_growth_percent:.2f}%)"
+    return response
 
 
 @tool()
-def ratio(a: float, b: float) -> dict:
+def ratio(a: float, b: float, formatted: bool = True) -> dict:
     """Calculate the ratio of two numbers.
 
     Args:
         a (float): First number
         b (float): Second number
+        formatted (bool): Include human-readable formatted strings in the result (default True)
 
     Returns:
         dict: Ratio a:b and simplified form
@@ -225,34 +323,39 @@ def ratio(a: float, b: float) -> dict:
 
     ratio_value = a / b
 
-    return {
+    response = {
         "operation": "ratio",
         "ratio_notation": f"{a}:{b}",
-        "decimal_form": ratio_value,
-        "formatted": f"{ratio_value:.4f}",
-        "percentage": f"{ratio_value * 100:.2f}%"
+        "decimal_form": ratio_value
     }
+    if formatted:
+        response["formatted"] = f"{ratio_value:.4f}"
+        response["percentage"] = f"{ratio_value * 100:.2f}%"
+    return response
 
 
 @tool()
-def sum_list(numbers: List[float]) -> dict:
+def sum_list(numbers: List[float], formatted: bool = True) -> dict:
     """Calculate the sum of a list of numbers.
 
     Args:
         numbers (List[float]): List of numbers to sum
+        formatted (bool): Include human-readable formatted strings in the result (default True)
 
     Returns:
         dict: Sum of all numbers
     """
-    total = sum(numbers)
+    total = sum(numbers)  # C-level reduction; see average()
 
-    return {
+    response = {
         "operation": "sum",
         "numbers": numbers,
         "count": len(numbers),
-        "sum": total,
-        "formatted": f"{total:,.2f}"
+        "sum": total
     }
+    if formatted:
+        response["formatted"] = f"{total:,.2f}"
+    return response
 
 
 if __name__ == "__main__":
@@ -273,3 +376,11 @@ if __name__ == "__main__":
     # Test compound growth
     print("\n4. Compound growth: $1000 at 5% for 10 periods")
     print(compound_growth(1000, 5, 10))
+
+    # Test compound growth over a rate schedule
+    print("\n5. Compound growth schedule: $1000 at 5%, 7%, 4%")
+    print(compound_growth_schedule(1000, [5, 7, 4]))
+
+    # Test batch percentage change
+    print("\n6. Percentage change batch: [100, 0, 200] -> [150, 10, 180]")
+    print(percentage_change_batch([100, 0, 200], [150, 10, 180]))
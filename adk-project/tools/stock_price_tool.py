@@ -2,31 +2,256 @@
 Stock Price Tool - Fetches real-time stock prices from Financial Modeling Prep API
 Uses watsonx Orchestrate connection environment variables for secure credential management
 """
+import copy
 import os
+import threading
+import time
 import requests
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Tuple
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+
+# Shared keep-alive session so repeated quote/search calls reuse TCP/TLS connections to FMP,
+# retrying rate limits and transient server errors with a short backoff
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Long-lived worker pool so quote batches for long symbol lists are fetched in parallel
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fmp-quote")
+
+# In-memory TTL cache of successful tool responses, keyed by (kind, upper-cased symbol or raw query).
+# Quotes go stale quickly, while search results for a query are stable for much longer.
+# Expired entries that carry an ETag are kept so the next request can revalidate them.
+_CACHE_TTL_SECONDS = {"quote": 30, "search": 300}
+_CACHE_MAX_ENTRIES = 1024
+_CACHE: Dict[Tuple[str, str], Tuple[float, Dict[str, Any], Optional[str]]] = {}  # (expires, result, etag)
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key: Tuple[str, str]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, str]]]:
+    """Return (private copy, None) on a hit, or (None, conditional headers) for a stale entry with an ETag"""
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            return None, None
+        expires, result, etag = entry
+        if expires <= time.monotonic():
+            if not etag:
+                del _CACHE[key]
+                return None, None
+            return None, {"If-None-Match": etag}
+    return copy.deepcopy(result), None
+
+
+def _cache_set(key: Tuple[str, str], result: Dict[str, Any], etag: Optional[str] = None) -> None:
+    expires = time.monotonic() + _CACHE_TTL_SECONDS[key[0]]
+    with _CACHE_LOCK:
+        if key not in _CACHE and len(_CACHE) >= _CACHE_MAX_ENTRIES:
+            # Evict the entry closest to expiry
+            del _CACHE[min(_CACHE, key=lambda k: _CACHE[k][0])]
+        _CACHE[key] = (expires, copy.deepcopy(result), etag)
+
+
+def _cache_revalidated(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    """Extend a stale entry after a 304 Not Modified and return a private copy of it"""
+    expires = time.monotonic() + _CACHE_TTL_SECONDS[key[0]]
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            return None
+        _CACHE[key] = (expires,) + entry[1:]
+    return copy.deepcopy(entry[1])
+
+
+# watsonx Orchestrate connection variables for the "stock_tool" app id, with a direct fallback
+_WXO_API_KEY_VAR = "WXO_CONNECTION_stock_tool_api_key"
+_WXO_BASE_URL_VAR = "WXO_CONNECTION_stock_tool_base_url"
+_FALLBACK_API_KEY_VAR = "FMP_API_KEY"
+_DEFAULT_BASE_URL = "https://financialmodelingprep.com/api/v3"
+
+_API_KEY_MISSING_ERROR = (
+    f"API key not configured. Please set {_WXO_API_KEY_VAR} or {_FALLBACK_API_KEY_VAR} environment variable."
+)
+
+_CONFIG: Optional[Dict[str, str]] = None
+
 
 def get_connection_config() -> Dict[str, str]:
     """
     Retrieve connection configuration from environment variables.
     Uses watsonx Orchestrate naming convention: WXO_CONNECTION_<app_id>_<field>
+
+    The environment is read once per process; a configuration without an API key is
+    re-read on the next call so a key exported after import is still picked up.
     """
-    app_id = "stock_tool"
+    global _CONFIG
+    if _CONFIG is not None:
+        return _CONFIG
 
     config = {
-        "api_key": os.getenv(f"WXO_CONNECTION_{app_id}_api_key"),
-        "base_url": os.getenv(f"WXO_CONNECTION_{app_id}_base_url", "https://financialmodelingprep.com/api/v3")
+        "api_key": os.getenv(_WXO_API_KEY_VAR),
+        "base_url": os.getenv(_WXO_BASE_URL_VAR, _DEFAULT_BASE_URL)
     }
 
     # Fallback to direct environment variables if WXO_ prefixed ones not found
     if not config["api_key"]:
-        config["api_key"] = os.getenv("FMP_API_KEY")
+        config["api_key"] = os.getenv(_FALLBACK_API_KEY_VAR)
 
+    if config["api_key"]:
+        _CONFIG = config
     return config
 
 
+def _reset_config() -> None:
+    """Forget the cached connection configuration so the environment is read again"""
+    global _CONFIG
+    _CONFIG = None
+
+
+# Maximum number of matches returned by search_stock
+_SEARCH_LIMIT = 10
+
+# FMP accepts comma-separated symbols on /quote; keep batches short enough for the URL
+_QUOTE_BATCH_SIZE = 20
+
+# (output key, FMP source key) projection for quote rows
+_QUOTE_FIELDS = (
+    ("symbol", "symbol"),
+    ("name", "name"),
+    ("price", "price"),
+    ("change", "change"),
+    ("change_percent", "changesPercentage"),
+    ("day_low", "dayLow"),
+    ("day_high", "dayHigh"),
+    ("year_low", "yearLow"),
+    ("year_high", "yearHigh"),
+    ("market_cap", "marketCap"),
+    ("volume", "volume"),
+    ("avg_volume", "avgVolume"),
+    ("open", "open"),
+    ("previous_close", "previousClose"),
+    ("eps", "eps"),
+    ("pe", "pe"),
+    ("timestamp", "timestamp"),
+)
+_QUOTE_OUT_KEYS = tuple(key for key, _ in _QUOTE_FIELDS)
+_QUOTE_SOURCE_KEYS = tuple(source for _, source in _QUOTE_FIELDS)
+_QUOTE_GETTER = itemgetter(*_QUOTE_SOURCE_KEYS)
+
+
+def _format_quote(stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the tool response for one FMP quote row.
+
+    The response is a plain dict because it is returned to Orchestrate as-is; a frozen
+    dataclass would need an asdict() pass and would break the deep-copying cache.
+    """
+    try:
+        values = _QUOTE_GETTER(stock_data)
+    except KeyError:
+        # FMP omits some fields on a few quotes; fall back to per-key lookups
+        values = [stock_data.get(source) for source in _QUOTE_SOURCE_KEYS]
+    quote = {"success": True}
+    quote.update(zip(_QUOTE_OUT_KEYS, values))
+    return quote
+
+
+def _fetch_quote_batch(batch: List[str], config: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch one comma-separated /quote batch, returning tool responses keyed by symbol"""
+    try:
+        url = f"{config['base_url']}/quote/{','.join(batch)}"
+        response = _SESSION.get(url, params={"apikey": config["api_key"]}, timeout=10)
+        response.raise_for_status()
+
+        data = _json_loads(response.content) or []
+        return {stock_data.get("symbol"): _format_quote(stock_data) for stock_data in data}
+
+    except requests.exceptions.Timeout:
+        error = "Request timed out. Please try again."
+    except Exception as e:
+        error = f"API request failed: {str(e)}"
+
+    return {symbol: {"success": False, "error": error, "symbol": symbol} for symbol in batch}
+
+
+def _fetch_quotes(symbols: List[str], config: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch quotes for several symbols with one /quote request per batch.
+
+    Args:
+        symbols: Upper-cased ticker symbols
+        config: Connection configuration from get_connection_config
+
+    Returns:
+        dict: Tool responses keyed by symbol; symbols missing from FMP's reply are left out
+    """
+    batches = [symbols[start:start + _QUOTE_BATCH_SIZE] for start in range(0, len(symbols), _QUOTE_BATCH_SIZE)]
+
+    quotes = {}
+    if len(batches) == 1:
+        quotes.update(_fetch_quote_batch(batches[0], config))
+    else:
+        # Overlap the round trips when the list spans several batches
+        for batch_quotes in _EXECUTOR.map(lambda batch: _fetch_quote_batch(batch, config), batches):
+            quotes.update(batch_quotes)
+    return quotes
+
+
+def _split_symbols(symbols: str) -> List[str]:
+    """Parse a comma-separated symbol string into its non-empty symbols"""
+    # Only trim around each symbol: dropping inner spaces would turn "BRK B" into another ticker
+    return [symbol for symbol in (token.strip() for token in symbols.split(",")) if symbol]
+
+
+def _quotes_by_symbol(symbol_list: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Quote responses for the given symbols, keyed by each symbol as the caller wrote it"""
+    config = get_connection_config()
+
+    if not config["api_key"]:
+        return {
+            symbol: {
+                "success": False,
+                "error": _API_KEY_MISSING_ERROR,
+                "symbol": symbol
+            }
+            for symbol in symbol_list
+        }
+
+    # One request per batch of symbols instead of one per symbol
+    quotes = _fetch_quotes(list(dict.fromkeys(symbol.upper() for symbol in symbol_list)), config)
+
+    results = {}
+    for symbol in symbol_list:
+        quote = quotes.get(symbol.upper())
+        if quote is None:
+            results[symbol] = {
+                "success": False,
+                "error": f"No data found for symbol: {symbol}",
+                "symbol": symbol
+            }
+        elif not quote["success"]:
+            # Errors echo the symbol as the caller sent it, not the upper-cased request symbol
+            results[symbol] = {**quote, "symbol": symbol}
+        else:
+            results[symbol] = quote
+    return results
+
+
 @tool()
 def get_stock_price(symbol: str) -> Dict[str, Any]:
     """Fetch current stock price for a given symbol.
@@ -42,18 +267,23 @@ def get_stock_price(symbol: str) -> Dict[str, Any]:
     if not config["api_key"]:
         return {
             "success": False,
-            "error": "API key not configured. Please set WXO_CONNECTION_stock_tool_api_key or FMP_API_KEY environment variable.",
+            "error": _API_KEY_MISSING_ERROR,
             "symbol": symbol
         }
 
+    cache_key = ("quote", symbol.upper())
+    cached, _ = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         url = f"{config['base_url']}/quote/{symbol.upper()}"
         params = {"apikey": config["api_key"]}
 
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
 
-        data = response.json()
+        data = _json_loads(response.content)
 
         if not data or len(data) == 0:
             return {
@@ -62,28 +292,9 @@ def get_stock_price(symbol: str) -> Dict[str, Any]:
                 "symbol": symbol
             }
 
-        stock_data = data[0]
-
-        return {
-            "success": True,
-            "symbol": stock_data.get("symbol"),
-            "name": stock_data.get("name"),
-            "price": stock_data.get("price"),
-            "change": stock_data.get("change"),
-            "change_percent": stock_data.get("changesPercentage"),
-            "day_low": stock_data.get("dayLow"),
-            "day_high": stock_data.get("dayHigh"),
-            "year_low": stock_data.get("yearLow"),
-            "year_high": stock_data.get("yearHigh"),
-            "market_cap": stock_data.get("marketCap"),
-            "volume": stock_data.get("volume"),
-            "avg_volume": stock_data.get("avgVolume"),
-            "open": stock_data.get("open"),
-            "previous_close": stock_data.get("previousClose"),
-            "eps": stock_data.get("eps"),
-            "pe": stock_data.get("pe"),
-            "timestamp": stock_data.get("timestamp")
-        }
+        result = _format_quote(data[0])
+        _cache_set(cache_key, result)
+        return result
 
     except requests.exceptions.Timeout:
         return {
@@ -115,12 +326,7 @@ def get_multiple_stocks(symbols: str) -> Dict[str, Any]:
     Returns:
         dict: Dictionary containing data for all requested symbols
     """
-    symbol_list = [s.strip() for s in symbols.split(",")]
-    results = {}
-
-    for symbol in symbol_list:
-        if symbol:
-            results[symbol] = get_stock_price(symbol)
+    results = _quotes_by_symbol(_split_symbols(symbols))
 
     return {
         "success": True,
@@ -144,21 +350,34 @@ def search_stock(query: str) -> Dict[str, Any]:
     if not config["api_key"]:
         return {
             "success": False,
-            "error": "API key not configured. Please set WXO_CONNECTION_stock_tool_api_key or FMP_API_KEY environment variable."
+            "error": _API_KEY_MISSING_ERROR
         }
 
+    cache_key = ("search", query)
+    cached, conditional_headers = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         url = f"{config['base_url']}/search"
         params = {
             "query": query,
-            "limit": 10,
+            "limit": _SEARCH_LIMIT,
             "apikey": config["api_key"]
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, headers=conditional_headers, timeout=10)
+
+        # Results unchanged since the cached copy: skip the body and JSON parse entirely
+        if response.status_code == 304:
+            cached = _cache_revalidated(cache_key)
+            if cached is not None:
+                return cached
+            response = _SESSION.get(url, params=params, timeout=10)
+
         response.raise_for_status()
 
-        data = response.json()
+        data = _json_loads(response.content)
 
         if not data:
             return {
@@ -167,7 +386,8 @@ def search_stock(query: str) -> Dict[str, Any]:
             }
 
         results = []
-        for item in data:
+        # Stop building rows at _SEARCH_LIMIT even if FMP returns more than asked for
+        for item in islice(data, _SEARCH_LIMIT):
             results.append({
                 "symbol": item.get("symbol"),
                 "name": item.get("name"),
@@ -176,12 +396,14 @@ def search_stock(query: str) -> Dict[str, Any]:
                 "exchange_short": item.get("exchangeShortName")
             })
 
-        return {
+        result = {
             "success": True,
             "query": query,
             "count": len(results),
             "results": results
         }
+        _cache_set(cache_key, result, etag=response.headers.get("ETag"))
+        return result
 
     except Exception as e:
         return {
@@ -191,6 +413,32 @@ def search_stock(query: str) -> Dict[str, Any]:
         }
 
 
+@tool()
+def lookup_stocks(symbols: str = "", queries: str = "") -> Dict[str, Any]:
+    """Fetch stock prices and run stock searches together in one call.
+
+    Args:
+        symbols (str): Comma-separated list of stock ticker symbols to quote (e.g., 'AAPL,MSFT')
+        queries (str): Comma-separated list of company names or symbols to search for (e.g., 'Apple,Tesla')
+
+    Returns:
+        dict: Dictionary containing quote data keyed by symbol and search results keyed by query
+    """
+    symbol_list = _split_symbols(symbols)
+    query_list = [query for query in (q.strip() for q in queries.split(",")) if query]
+
+    # Searches run on the worker pool while the quotes are fetched on this thread
+    searches = {query: _EXECUTOR.submit(search_stock, query) for query in dict.fromkeys(query_list)}
+    stocks = _quotes_by_symbol(symbol_list)
+
+    return {
+        "success": True,
+        "count": len(stocks) + len(searches),
+        "stocks": stocks,
+        "searches": {query: future.result() for query, future in searches.items()}
+    }
+
+
 if __name__ == "__main__":
     print("Testing stock price tool...")
 
@@ -205,3 +453,7 @@ if __name__ == "__main__":
     print("\n3. Getting multiple stocks:")
     multi_result = get_multiple_stocks("AAPL,MSFT,GOOGL")
     print(multi_result)
+
+    print("\n4. Quoting and searching in one call:")
+    lookup_result = lookup_stocks("AAPL,MSFT", "Tesla,Nvidia")
+    print(lookup_result)
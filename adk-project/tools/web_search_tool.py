@@ -2,9 +2,29 @@
 Web Search Tool - DuckDuckGo-based web search for gathering market intelligence and news
 Provides web search capabilities without requiring API keys
 """
+import threading
 from typing import Dict, List
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
+try:
+    from duckduckgo_search import DDGS
+except ImportError:
+    DDGS = None
+
+# One DDGS client per process, so its HTTP session and connections are reused across searches
+_DDGS = None
+_DDGS_LOCK = threading.Lock()
+
+
+def _get_ddgs():
+    """Create the shared DDGS client on first use"""
+    global _DDGS
+    if _DDGS is None:
+        with _DDGS_LOCK:
+            if _DDGS is None:
+                _DDGS = DDGS()
+    return _DDGS
+
 
 @tool()
 def web_search(query: str, max_results: int = 5) -> Dict:
@@ -17,9 +37,7 @@ def web_search(query: str, max_results: int = 5) -> Dict:
     Returns:
         dict: Search results containing titles, snippets, and URLs
     """
-    try:
-        from duckduckgo_search import DDGS
-    except ImportError:
+    if DDGS is None:
         return {
             "error": "duckduckgo-search library not installed. Please install it with: pip install duckduckgo-search",
             "query": query
@@ -29,13 +47,11 @@ def web_search(query: str, max_results: int = 5) -> Dict:
     max_results = min(max(1, max_results), 10)
 
     try:
-        ddgs = DDGS()
+        ddgs = _get_ddgs()
         results = []
 
-        # Get search results - ddgs.text returns a generator
-        search_results = list(ddgs.text(query, max_results=max_results))
-
-        for idx, result in enumerate(search_results, 1):
+        # ddgs.text returns a generator; build results as it yields instead of listing it first
+        for idx, result in enumerate(ddgs.text(query, max_results=max_results), 1):
             results.append({
                 "position": idx,
                 "title": result.get("title", "No title"),
@@ -71,9 +87,7 @@ def web_search_news(query: str, max_results: int = 5) -> Dict:
     Returns:
         dict: News articles with titles, snippets, URLs, and publication dates
     """
-    try:
-        from duckduckgo_search import DDGS
-    except ImportError:
+    if DDGS is None:
         return {
             "error": "duckduckgo-search library not installed. Please install it with: pip install duckduckgo-search",
             "query": query
@@ -83,13 +97,11 @@ def web_search_news(query: str, max_results: int = 5) -> Dict:
     max_results = min(max(1, max_results), 10)
 
     try:
-        ddgs = DDGS()
+        ddgs = _get_ddgs()
         results = []
 
-        # Get news results - ddgs.news returns a generator
-        news_results = list(ddgs.news(query, max_results=max_results))
-
-        for idx, result in enumerate(news_results, 1):
+        # ddgs.news returns a generator; build results as it yields instead of listing it first
+        for idx, result in enumerate(ddgs.news(query, max_results=max_results), 1):
             results.append({
                 "position": idx,
                 "title": result.get("title", "No title"),
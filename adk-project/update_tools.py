@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 """Script to update all tool functions with expected_credentials"""
+import re
+
+# Tool modules that authenticate through the fmp_financial_api connection
+_TOOL_FILES = (
+    'tools/financial_analysis_tool.py',
+)
 
-with open('tools/financial_analysis_tool.py', 'r') as f:
-    content = f.read()
+# Trailing `connection` parameter on tool signatures, and the matching make_fmp_request argument
+_SIG_RE = re.compile(r'(def \w+\([^)]+), connection: Dict\[str, Any\] = None\)')
+_CALL_RE = re.compile(r'make_fmp_request\(([^,]+), ([^,]+), connection\)')
 
 # Replace simple @tool() with proper decorator
 new_decorator = '''@tool(
@@ -13,17 +20,32 @@ new_decorator = '''@tool(
     )]
 )'''
 
-# Replace all @tool() (except the one already updated)
-content = content.replace('@tool()\n', f'{new_decorator}\n')
 
-# Remove connection parameter from all function signatures
-import re
-content = re.sub(r'(def \w+\([^)]+), connection: Dict\[str, Any\] = None\)', r'\1)', content)
+def update_file(path: str) -> bool:
+    """Rewrite one tool file in place; returns False when it was already up to date"""
+    with open(path, 'r') as f:
+        original = f.read()
+
+    # Replace all @tool() (except the one already updated)
+    content = original.replace('@tool()\n', f'{new_decorator}\n')
+
+    # Remove connection parameter from all function signatures
+    content = _SIG_RE.sub(r'\1)', content)
+
+    # Remove connection argument from make_fmp_request calls
+    content = _CALL_RE.sub(r'make_fmp_request(\1, \2)', content)
+
+    if content == original:
+        return False
 
-# Remove connection argument from make_fmp_request calls
-content = re.sub(r'make_fmp_request\(([^,]+), ([^,]+), connection\)', r'make_fmp_request(\1, \2)', content)
+    with open(path, 'w') as f:
+        f.write(content)
+    return True
 
-with open('tools/financial_analysis_tool.py', 'w') as f:
-    f.write(content)
 
-print("Tool file updated successfully!")
+if __name__ == "__main__":
+    for path in _TOOL_FILES:
+        if update_file(path):
+            print(f"{path} updated successfully!")
+        else:
+            print(f"{path} already up to date")
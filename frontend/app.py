@@ -3,11 +3,14 @@ Financial Analyst Agent - Streamlit Chat Interface
 Cloud-deployed IBM watsonx Orchestrate Agent Integration
 """
 import streamlit as st
-import streamlit.components.v1 as components
 import os
-from datetime import datetime
-from orchestrate_client import WatsonxOrchestrateClient
-from typing import List, Dict
+import time
+import uuid
+from typing import TYPE_CHECKING, List, Dict
+import chat_store
+
+if TYPE_CHECKING:
+    from orchestrate_client import WatsonxOrchestrateClient
 
 
 # Page configuration
@@ -19,7 +22,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS = """
     <style>
     .main {
         padding: 1rem;
@@ -49,7 +52,112 @@ st.markdown("""
         margin-bottom: 0.5rem;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+st.markdown(_CSS, unsafe_allow_html=True)
+
+
+# Bounded so clients for replaced credentials are evicted; once unreferenced they are
+# collected, which also cancels their background token refresh
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_client(instance_url: str, api_key: str) -> "WatsonxOrchestrateClient":
+    """Shared client per (instance_url, api_key), so its IAM token and session survive reruns"""
+    # Imported on first connect so the welcome page doesn't pay for the client's imports
+    from orchestrate_client import WatsonxOrchestrateClient
+    return WatsonxOrchestrateClient(instance_url, api_key)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def list_agents_cached(instance_url: str, api_key: str) -> List[Dict]:
+    """Agents in the instance, refreshed at most every five minutes"""
+    agents = get_client(instance_url, api_key).list_agents()
+    if not agents:
+        # The client returns [] on failure too; raise so it is not cached and the next fetch retries
+        raise LookupError("No agents found in this instance")
+    return agents
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_agent_info_cached(instance_url: str, api_key: str, agent_id: str) -> Dict:
+    """Agent details, refreshed at most every five minutes"""
+    agent_info = get_client(instance_url, api_key).get_agent_info(agent_id)
+    if agent_info is None:
+        # Raise so the failed lookup is not cached and the next rerun retries it
+        raise LookupError(f"Agent {agent_id} not found")
+    return agent_info
+
+
+# Number of most recent chat messages rendered per rerun; older ones load on request
+HISTORY_WINDOW = 50
+
+
+# Messages held in session state before older ones are spilled to the chat store
+MAX_HOT_MESSAGES = 200
+# Messages kept in session state after a spill
+HOT_MESSAGES_AFTER_SPILL = 100
+
+
+# Display format for message timestamps; stored messages keep the formatted string
+TIMESTAMP_FORMAT = "%I:%M %p"
+
+
+def now_timestamp() -> str:
+    """Current local time formatted for a chat message"""
+    return time.strftime(TIMESTAMP_FORMAT)
+
+
+def load_earlier_messages():
+    """Widen the rendered chat history by one window"""
+    st.session_state.history_window += HISTORY_WINDOW
+
+
+def spill_history():
+    """Move all but the most recent messages out of session state into the chat store"""
+    messages = st.session_state.messages
+    if len(messages) <= MAX_HOT_MESSAGES:
+        return
+
+    spilled = messages[:-HOT_MESSAGES_AFTER_SPILL]
+    chat_store.append(st.session_state.session_id, st.session_state.spilled_count, spilled)
+    st.session_state.spilled_count += len(spilled)
+    st.session_state.messages = messages[-HOT_MESSAGES_AFTER_SPILL:]
+    # api_messages is appended in lockstep, so the same tail lines up with the kept messages
+    st.session_state.api_messages = st.session_state.api_messages[-HOT_MESSAGES_AFTER_SPILL:]
+
+
+# Most recent history messages sent with each prompt (20 user/assistant turns)
+MAX_HISTORY_MESSAGES = 40
+
+
+def compact_history(messages: List[Dict], keep_tool_messages: int = 4) -> List[Dict]:
+    """
+    Drop content the agent no longer needs before sending the history
+
+    Args:
+        messages: API-format messages, oldest first
+        keep_tool_messages: Number of most recent tool results to keep
+
+    Returns:
+        The last MAX_HISTORY_MESSAGES messages, without older tool results or repeated system prompts
+    """
+    tool_budget = keep_tool_messages
+    compacted = []
+    last_system = None
+    # Walk newest first so the tool budget keeps the latest results
+    for message in reversed(messages):
+        role = message["role"]
+        if role == "tool":
+            if tool_budget <= 0:
+                continue
+            tool_budget -= 1
+        elif role == "system":
+            if message["content"] == last_system:
+                continue
+            last_system = message["content"]
+        compacted.append(message)
+        if len(compacted) == MAX_HISTORY_MESSAGES:
+            break
+    compacted.reverse()
+    return compacted
 
 
 def initialize_session_state():
@@ -57,6 +165,10 @@ def initialize_session_state():
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
+    # API-format mirror of messages (role and content only), appended in lockstep
+    if "api_messages" not in st.session_state:
+        st.session_state.api_messages = []
+
     if "client" not in st.session_state:
         st.session_state.client = None
 
@@ -69,9 +181,18 @@ def initialize_session_state():
     if "connected" not in st.session_state:
         st.session_state.connected = False
 
+    if "history_window" not in st.session_state:
+        st.session_state.history_window = HISTORY_WINDOW
 
+    # Identifies this session's messages in the chat store; spilled_count of them live there
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+        st.session_state.spilled_count = 0
+
+
+@st.cache_resource(show_spinner=False)
 def load_config():
-    """Load configuration from environment variables or .env file"""
+    """Load configuration from environment variables or .env file, once per process"""
     try:
         from dotenv import load_dotenv
         load_dotenv()
@@ -127,14 +248,11 @@ def sidebar_config():
                 else:
                     with st.spinner("Fetching agents from cloud..."):
                         try:
-                            temp_client = WatsonxOrchestrateClient(instance_url, api_key)
-                            agents = temp_client.list_agents()
-
-                            if agents:
-                                st.session_state.agents_list = agents
-                                st.success(f"✅ Found {len(agents)} agent(s)!")
-                            else:
-                                st.warning("No agents found in this instance")
+                            agents = list_agents_cached(instance_url, api_key)
+                            st.session_state.agents_list = agents
+                            st.success(f"✅ Found {len(agents)} agent(s)!")
+                        except LookupError:
+                            st.warning("No agents found in this instance")
                         except Exception as e:
                             st.error(f"Failed to fetch agents: {str(e)}")
 
@@ -176,7 +294,7 @@ def sidebar_config():
                     else:
                         with st.spinner("Connecting..."):
                             try:
-                                client = WatsonxOrchestrateClient(instance_url, api_key)
+                                client = get_client(instance_url, api_key)
                                 # Test connection by getting agent info
                                 agent_info = client.get_agent_info(agent_id)
 
@@ -195,6 +313,10 @@ def sidebar_config():
                 if st.button("🔄 Refresh", use_container_width=True):
                     st.session_state.connected = False
                     st.session_state.client = None
+                    list_agents_cached.clear()
+                    get_agent_info_cached.clear()
+                    if instance_url and api_key:
+                        get_client(instance_url, api_key).refresh_agents()
                     st.rerun()
 
         # Agent Info
@@ -203,7 +325,13 @@ def sidebar_config():
             st.subheader("🤖 Agent Information")
 
             with st.spinner("Loading agent info..."):
-                agent_info = st.session_state.client.get_agent_info(st.session_state.agent_id)
+                client = st.session_state.client
+                try:
+                    agent_info = get_agent_info_cached(
+                        client.instance_url, client.auth.api_key, st.session_state.agent_id
+                    )
+                except LookupError:
+                    agent_info = None
 
                 if agent_info:
                     st.markdown(f"""
@@ -223,6 +351,11 @@ def sidebar_config():
 
         if st.button("🗑️ Clear Chat History", use_container_width=True):
             st.session_state.messages = []
+            st.session_state.api_messages = []
+            st.session_state.history_window = HISTORY_WINDOW
+            if st.session_state.spilled_count:
+                chat_store.clear(st.session_state.session_id)
+                st.session_state.spilled_count = 0
             st.rerun()
 
         # Example Queries
@@ -247,20 +380,78 @@ def sidebar_config():
             ]
         }
 
-        for category, queries in examples.items():
-            with st.expander(category):
-                for query in queries:
-                    if st.button(query, key=query, use_container_width=True):
-                        if st.session_state.connected:
-                            st.session_state.user_input = query
-                            st.rerun()
-                        else:
-                            st.warning("Please connect to the agent first")
+        # One selectbox and one button instead of a button per example
+        example_categories = {query: category for category, queries in examples.items() for query in queries}
 
+        example = st.selectbox(
+            "Try an example",
+            options=[""] + list(example_categories),
+            format_func=lambda query: f"{example_categories[query]}: {query}" if query else "Choose an example...",
+            label_visibility="collapsed"
+        )
 
-def render_watson_orchestrate_chat():
-    """Render Watson Orchestrate embedded chat widget"""
-    watson_orchestrate_html = """
+        if st.button("▶️ Use Example", disabled=not example, use_container_width=True):
+            if st.session_state.connected:
+                st.session_state.user_input = example
+                st.rerun()
+            else:
+                st.warning("Please connect to the agent first")
+
+
+# Embedded watsonx Orchestrate chat page
+_WXO_HTML_PROD = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <style>
+            body, html {
+                margin: 0;
+                padding: 0;
+                width: 100%;
+                height: 100%;
+                background-color: #f5f5f5;
+            }
+            #root {
+                width: 100%;
+                height: 100%;
+                min-height: 700px;
+            }
+        </style>
+    </head>
+    <body>
+        <div id="root"></div>
+
+        <script>
+            window.wxOConfiguration = {
+                orchestrationID: "097a2cc6c9244419ae143b766eb0f746_be51f0bb-5afa-4282-a25a-f053bd49296f",
+                hostURL: "https://eu-de.watson-orchestrate.cloud.ibm.com",
+                rootElementID: "root",
+                showLauncher: true,
+                crn: "crn:v1:bluemix:public:watsonx-orchestrate:eu-de:a/097a2cc6c9244419ae143b766eb0f746:be51f0bb-5afa-4282-a25a-f053bd49296f::",
+                deploymentPlatform: "ibmcloud",
+                chatOptions: {
+                    agentId: "fc512c24-b39c-4d88-a9a3-5ab41b16c813"
+                }
+            };
+
+            const script = document.createElement('script');
+            script.src = 'https://eu-de.watson-orchestrate.cloud.ibm.com/wxochat/wxoLoader.js?embed=true';
+            script.onload = function() {
+                const instance = wxoLoader.init();
+                if (instance && typeof instance.openWindow === 'function') {
+                    instance.openWindow();
+                }
+            };
+            document.head.appendChild(script);
+        </script>
+    </body>
+    </html>
+    """
+
+# Same page with step-by-step load diagnostics, served when the app is opened with ?debug=1
+_WXO_HTML_DEBUG = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -383,7 +574,12 @@ def render_watson_orchestrate_chat():
     </html>
     """
 
-    components.html(watson_orchestrate_html, height=800, scrolling=False)
+
+def render_watson_orchestrate_chat():
+    """Render Watson Orchestrate embedded chat widget"""
+    import streamlit.components.v1 as components
+    html = _WXO_HTML_DEBUG if st.query_params.get("debug") == "1" else _WXO_HTML_PROD
+    components.html(html, height=800, scrolling=False)
 
 
 def display_welcome_message():
@@ -422,22 +618,29 @@ def display_welcome_message():
     render_watson_orchestrate_chat()
 
 
-def main():
-    """Main Streamlit application"""
-    initialize_session_state()
-    sidebar_config()
-
-    # Check if connected
-    if not st.session_state.connected:
-        display_welcome_message()
-        return
-
-    # Main chat interface
-    st.title("📊 Financial Analyst AI")
-    st.caption(f"Connected to Agent: `{st.session_state.agent_id}`")
+@st.fragment
+def chat_area():
+    """Chat history and input; reruns on its own so chatting doesn't rebuild the sidebar"""
+    # Display chat history, only the most recent window of it
+    messages = st.session_state.messages
+    window = st.session_state.history_window
+    spilled_count = st.session_state.spilled_count
+    total = spilled_count + len(messages)
+    if total > window:
+        st.button(
+            f"⬆️ Load earlier messages ({total - window} hidden)",
+            on_click=load_earlier_messages
+        )
+
+    if window > len(messages) and spilled_count:
+        # The window reaches past session state into messages spilled to the store
+        visible = chat_store.load_range(
+            st.session_state.session_id, max(0, total - window), spilled_count
+        ) + messages
+    else:
+        visible = messages[-window:]
 
-    # Display chat history
-    for message in st.session_state.messages:
+    for message in visible:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
             if "timestamp" in message:
@@ -453,12 +656,13 @@ def main():
 
     if prompt:
         # Add user message to chat
-        timestamp = datetime.now().strftime("%I:%M %p")
+        timestamp = now_timestamp()
         st.session_state.messages.append({
             "role": "user",
             "content": prompt,
             "timestamp": timestamp
         })
+        st.session_state.api_messages.append({"role": "user", "content": prompt})
 
         # Display user message
         with st.chat_message("user"):
@@ -467,22 +671,13 @@ def main():
 
         # Get agent response
         with st.chat_message("assistant"):
-            with st.spinner("🤔 Analyzing..."):
-                # Convert messages to API format (without timestamps)
-                api_messages = [
-                    {"role": msg["role"], "content": msg["content"]}
-                    for msg in st.session_state.messages
-                ]
-
-                response = st.session_state.client.invoke_agent(
-                    st.session_state.agent_id,
-                    prompt,
-                    api_messages[:-1]  # Exclude the current user message
-                )
-
-            # Display response
-            st.markdown(response)
-            response_timestamp = datetime.now().strftime("%I:%M %p")
+            # Display the response as it streams in
+            response = st.write_stream(st.session_state.client.invoke_agent_stream(
+                st.session_state.agent_id,
+                prompt,
+                compact_history(st.session_state.api_messages[:-1])  # Exclude the current user message
+            ))
+            response_timestamp = now_timestamp()
             st.caption(f"_{response_timestamp}_")
 
             # Add assistant message to chat
@@ -491,6 +686,26 @@ def main():
                 "content": response,
                 "timestamp": response_timestamp
             })
+            st.session_state.api_messages.append({"role": "assistant", "content": response})
+
+        spill_history()
+
+
+def main():
+    """Main Streamlit application"""
+    initialize_session_state()
+    sidebar_config()
+
+    # Check if connected
+    if not st.session_state.connected:
+        display_welcome_message()
+        return
+
+    # Main chat interface
+    st.title("📊 Financial Analyst AI")
+    st.caption(f"Connected to Agent: `{st.session_state.agent_id}`")
+
+    chat_area()
 
 
 if __name__ == "__main__":
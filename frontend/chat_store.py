@@ -0,0 +1,139 @@
+"""
+Chat History Store
+Spills older chat messages to a local SQLite file so session state only holds recent ones
+"""
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chat_history.sqlite3")
+
+# Stored messages are only readable by the Streamlit session that wrote them, so rows
+# outlive their session once it ends; anything older than this is deleted
+RETENTION_SECONDS = 24 * 60 * 60
+_PURGE_INTERVAL_SECONDS = 60 * 60
+
+logger = logging.getLogger(__name__)
+
+# All database access runs on one worker thread: writes stay off the Streamlit script
+# thread, and reads queued behind them always see the messages appended before
+_WORKER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-store")
+_CONN = None
+_NEXT_PURGE = 0.0
+
+
+def _connect() -> sqlite3.Connection:
+    """Connection owned by the worker thread, creating the table on first use"""
+    global _CONN
+    if _CONN is None:
+        # Read on first use so a CHAT_STORE_PATH loaded from .env after import still applies
+        conn = sqlite3.connect(os.getenv("CHAT_STORE_PATH", DEFAULT_DB_PATH))
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS messages (
+                session_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                message TEXT NOT NULL,
+                created_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (session_id, position)
+            )
+            """
+        )
+        # Files written before rows were timestamped get the column with 0, so they purge first
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(messages)")}
+        if "created_at" not in columns:
+            conn.execute("ALTER TABLE messages ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS messages_created_at ON messages (created_at)")
+        conn.commit()
+        _CONN = conn
+    return _CONN
+
+
+def _purge_expired(conn: sqlite3.Connection):
+    """Delete rows past RETENTION_SECONDS, at most once per _PURGE_INTERVAL_SECONDS"""
+    global _NEXT_PURGE
+    now = time.monotonic()
+    if now < _NEXT_PURGE:
+        return
+    _NEXT_PURGE = now + _PURGE_INTERVAL_SECONDS
+    with conn:
+        conn.execute("DELETE FROM messages WHERE created_at < ?", (time.time() - RETENTION_SECONDS,))
+
+
+def _log_failure(future: Future):
+    """Done callback: background writes have no caller waiting, so report errors here"""
+    error = future.exception()
+    if error is not None:
+        logger.error("Chat store write failed: %s", error)
+
+
+def _insert(session_id: str, start: int, messages: List[Dict]):
+    conn = _connect()
+    _purge_expired(conn)
+    created_at = time.time()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO messages (session_id, position, message, created_at) VALUES (?, ?, ?, ?)",
+            [
+                (session_id, start + offset, json.dumps(message), created_at)
+                for offset, message in enumerate(messages)
+            ]
+        )
+
+
+def _delete(session_id: str):
+    conn = _connect()
+    with conn:
+        conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+
+def append(session_id: str, start: int, messages: List[Dict]) -> Future:
+    """
+    Store messages in the background
+
+    Args:
+        session_id: Chat session the messages belong to
+        start: Position of the first message in the session's full history
+        messages: Messages to store, oldest first
+
+    Returns:
+        Future that completes once the rows are written
+    """
+    future = _WORKER.submit(_insert, session_id, start, list(messages))
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def clear(session_id: str) -> Future:
+    """Delete a session's stored messages in the background"""
+    future = _WORKER.submit(_delete, session_id)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _select(session_id: str, start: int, end: int) -> List[Dict]:
+    rows = _connect().execute(
+        "SELECT message FROM messages WHERE session_id = ? AND position >= ? AND position < ? ORDER BY position",
+        (session_id, start, end)
+    ).fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+
+def load_range(session_id: str, start: int, end: int) -> List[Dict]:
+    """
+    Load stored messages with positions in [start, end)
+
+    Args:
+        session_id: Chat session to read
+        start: First position to load
+        end: Position after the last one to load
+
+    Returns:
+        List of messages, oldest first
+    """
+    return _WORKER.submit(_select, session_id, start, end).result()
@@ -2,6 +2,7 @@
 Debug script to test watsonx Orchestrate connection and find agents
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from orchestrate_client import WatsonxOrchestrateClient
 import json
@@ -50,6 +51,10 @@ except Exception as e:
     print(f"   ❌ Authentication failed: {str(e)}")
     exit(1)
 
+# The agent lookup doesn't depend on the listing, so start it now and overlap the two round trips
+executor = ThreadPoolExecutor(max_workers=1)
+agent_info_future = executor.submit(client.get_agent_info, agent_id)
+
 print("\n3. Listing Available Agents...")
 try:
     agents = client.list_agents()
@@ -86,7 +91,7 @@ except Exception as e:
 print("\n4. Testing Connection to Specific Agent...")
 print(f"   Trying to connect to: {agent_id}")
 try:
-    agent_info = client.get_agent_info(agent_id)
+    agent_info = agent_info_future.result()
 
     if agent_info:
         print(f"   ✅ Successfully connected to agent!")
@@ -100,7 +105,9 @@ try:
             print(f"      - {agent.get('id')}")
         print("\n   Update your .env file with the correct AGENT_ID")
 except Exception as e:
+    agent_info = None
     print(f"   ❌ Error getting agent info: {str(e)}")
+executor.shutdown()
 
 print("\n5. Testing Chat Functionality...")
 if agent_info:
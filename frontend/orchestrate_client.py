@@ -3,9 +3,43 @@ IBM watsonx Orchestrate Cloud Client
 Handles authentication and API communication with cloud-deployed agents
 """
 import requests
+import copy
+import functools
 import json
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+logger = logging.getLogger(__name__)
+
+
+def _json_object(content) -> Dict:
+    """Decode a JSON response body that must be an object; anything else raises ValueError"""
+    data = _json_loads(content)
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+    return data
+
+
+class IBMCloudAuthError(Exception):
+    """Raised when an IBM Cloud access token cannot be obtained"""
 
 
 class IBMCloudAuth:
@@ -13,6 +47,10 @@ class IBMCloudAuth:
 
     IAM_TOKEN_URL = "https://iam.cloud.ibm.com/identity/token"
 
+    # Background refresh fires this long before expiry, ahead of the 5-minute margin
+    # get_access_token applies, so requests never wait on IAM while the refresh works
+    REFRESH_AHEAD_SECONDS = 600
+
     def __init__(self, api_key: str):
         """
         Initialize IBM Cloud authentication
@@ -22,7 +60,33 @@ class IBMCloudAuth:
         """
         self.api_key = api_key
         self.access_token = None
-        self.token_expiry = None
+        # time.monotonic() deadline for reusing the token: its expiry minus a 5-minute margin.
+        # Monotonic time is unaffected by wall-clock adjustments.
+        self._token_valid_until = 0.0
+        # Reused across refreshes so each hourly token request skips a new TLS handshake
+        self._session = requests.Session()
+        self._session.headers.update({"Accept": "application/json"})
+        # Serializes refreshes so concurrent requests at expiry trigger a single IAM call
+        self._lock = threading.Lock()
+        # Cancels the pending refresh timer; also runs if this object is garbage collected
+        self._cancel_timer = None
+        self._closed = False
+        self._refresh_listeners: List[weakref.WeakMethod] = []
+
+    def add_refresh_listener(self, callback: Callable[[], None]):
+        """
+        Call a bound method after each successful token refresh, off the requesting thread
+
+        Only a weak reference is kept, so registering doesn't keep the owner alive.
+        """
+        self._refresh_listeners.append(weakref.WeakMethod(callback))
+
+    def _notify_refresh(self):
+        # Called outside the refresh lock: listeners usually make requests that need a token
+        for ref in self._refresh_listeners:
+            callback = ref()
+            if callback is not None:
+                callback()
 
     def get_access_token(self) -> str:
         """
@@ -32,19 +96,71 @@ class IBMCloudAuth:
             Valid IBM Cloud access token
         """
         # Check if we have a valid token
-        if self.access_token and self.token_expiry:
-            if datetime.now() < self.token_expiry - timedelta(minutes=5):
+        if self.access_token and time.monotonic() < self._token_valid_until:
+            return self.access_token
+
+        # Get new token, unless another thread refreshed it while we waited
+        with self._lock:
+            if self.access_token and time.monotonic() < self._token_valid_until:
                 return self.access_token
+            self._refresh_token()
+            access_token = self.access_token
+
+        # A request is waiting on this token, so listeners run on their own thread
+        if self._refresh_listeners:
+            threading.Thread(target=self._notify_refresh, name="iam-refresh-listeners", daemon=True).start()
+        return access_token
+
+    def close(self):
+        """Stop background token refreshes and release the IAM connection"""
+        with self._lock:
+            self._closed = True
+            if self._cancel_timer is not None:
+                self._cancel_timer()
+        self._session.close()
+
+    def _schedule_refresh(self, expires_in: int):
+        """Arm a daemon timer that refreshes the token before it expires"""
+        if self._cancel_timer is not None:
+            self._cancel_timer()
+        if self._closed:
+            return
+
+        # The timer only holds a weak reference, so an abandoned auth object can still be
+        # collected; collecting it cancels the timer through the finalizer
+        timer = threading.Timer(
+            max(expires_in - self.REFRESH_AHEAD_SECONDS, 60),
+            IBMCloudAuth._refresh_from_timer,
+            args=(weakref.ref(self),)
+        )
+        timer.daemon = True
+        self._cancel_timer = weakref.finalize(self, timer.cancel)
+        timer.start()
+
+    @staticmethod
+    def _refresh_from_timer(ref: "weakref.ref[IBMCloudAuth]"):
+        auth = ref()
+        if auth is not None:
+            auth._refresh_token_safe()
+
+    def _refresh_token_safe(self):
+        """Background refresh; on failure the next request refreshes synchronously instead"""
+        try:
+            with self._lock:
+                if self._closed:
+                    return
+                self._refresh_token()
+        except IBMCloudAuthError as e:
+            logger.warning("Background token refresh failed: %s", e)
+            return
 
-        # Get new token
-        self._refresh_token()
-        return self.access_token
+        # Already off the request path, so listeners run on the timer thread itself
+        self._notify_refresh()
 
     def _refresh_token(self):
         """Refresh the IBM Cloud access token"""
         headers = {
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Accept": "application/json"
+            "Content-Type": "application/x-www-form-urlencoded"
         }
 
         data = {
@@ -53,7 +169,7 @@ class IBMCloudAuth:
         }
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.IAM_TOKEN_URL,
                 headers=headers,
                 data=data,
@@ -66,15 +182,58 @@ class IBMCloudAuth:
 
             # Token expires in 3600 seconds (1 hour)
             expires_in = token_data.get("expires_in", 3600)
-            self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
+            self._token_valid_until = time.monotonic() + expires_in - 300
+
+            self._schedule_refresh(expires_in)
+
+        except (requests.RequestException, ValueError) as e:
+            raise IBMCloudAuthError(f"Failed to get IBM Cloud access token: {str(e)}") from e
+
+
+class BearerAuth(requests.auth.AuthBase):
+    """Attaches the current IBM Cloud access token to each outgoing request"""
+
+    def __init__(self, auth: IBMCloudAuth):
+        self.auth = auth
+        # (token, header value) swapped as one tuple so concurrent requests never mix them
+        self._cached = (None, None)
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        # Rebuild the header value only when the token rotates
+        access_token = self.auth.get_access_token()
+        token, header = self._cached
+        if access_token is not token:
+            header = f"Bearer {access_token}"
+            self._cached = (access_token, header)
+        request.headers["Authorization"] = header
+        return request
 
-        except Exception as e:
-            raise Exception(f"Failed to get IBM Cloud access token: {str(e)}")
+
+@functools.lru_cache(maxsize=64)
+def _agent_url(agents_url: str, agent_id: str) -> str:
+    """URL of one agent, memoized per (instance, agent)"""
+    return f"{agents_url}/{agent_id}"
+
+
+@functools.lru_cache(maxsize=64)
+def _chat_url(agents_url: str, agent_id: str) -> str:
+    """Chat completions URL of one agent, memoized per (instance, agent)"""
+    return f"{agents_url}/{agent_id}/chat/completions"
+
+
+# Failures a request can hit: transport and HTTP errors, undecodable bodies, and token errors
+_REQUEST_ERRORS = (requests.RequestException, ValueError, IBMCloudAuthError)
 
 
 class WatsonxOrchestrateClient:
     """Client for interacting with watsonx Orchestrate cloud agents"""
 
+    # Agent metadata changes rarely, so listings and agent details are reused for this long
+    AGENT_CACHE_TTL_SECONDS = 300
+
+    # Token refreshes only prefetch agents for a client that served a request this recently
+    PREFETCH_IDLE_SECONDS = 3600
+
     def __init__(self, instance_url: str, api_key: str):
         """
         Initialize the watsonx Orchestrate client
@@ -84,17 +243,66 @@ class WatsonxOrchestrateClient:
             api_key: IBM Cloud API key
         """
         self.instance_url = instance_url.rstrip('/')
+        self._agents_url = f"{self.instance_url}/v1/agents"
         self.auth = IBMCloudAuth(api_key)
+        # Pool sized for concurrent Streamlit sessions sharing this client. Only idempotent
+        # requests are retried: replaying a chat completion could run the agent twice.
         self.session = requests.Session()
-
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers with fresh authentication token"""
-        access_token = self.auth.get_access_token()
-        return {
-            "Authorization": f"Bearer {access_token}",
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        ))
+        # Static headers are session defaults; only the token is applied per request.
+        # urllib3's ACCEPT_ENCODING adds br (and zstd) only when it can decode them.
+        self.session.headers.update({
             "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
+            "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING
+        })
+        self.session.auth = BearerAuth(self.auth)
+        # (expires, value) for "agents" and "agent:<id>"; failures are never cached
+        self._meta_cache: Dict[str, Tuple[float, Any]] = {}
+        self._meta_lock = threading.Lock()
+        # Lets one listing request run at a time; callers waiting on it then hit the cache
+        self._agents_fetch_lock = threading.Lock()
+        # Warm the agent listing on first login and on background token refreshes
+        self._last_used = time.monotonic()
+        self.auth.add_refresh_listener(self._prefetch_agents)
+
+    def close(self):
+        """Stop the background token refresh and close pooled connections"""
+        self.auth.close()
+        self.session.close()
+
+    def _meta_get(self, key: str) -> Optional[Any]:
+        """Return a copy of an unexpired cached agent lookup, or None"""
+        with self._meta_lock:
+            entry = self._meta_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._meta_cache[key]
+                return None
+            # Copy so callers can't mutate what later calls receive
+            return copy.deepcopy(entry[1])
+
+    def _meta_set(self, key: str, value: Any):
+        with self._meta_lock:
+            self._meta_cache[key] = (
+                time.monotonic() + self.AGENT_CACHE_TTL_SECONDS, copy.deepcopy(value)
+            )
+
+    def _prefetch_agents(self):
+        """Fill the agent listing cache, unless it is still fresh or the client is idle"""
+        if time.monotonic() - self._last_used > self.PREFETCH_IDLE_SECONDS:
+            return
+        self._list_agents()
+
+    def refresh_agents(self):
+        """Drop cached agent listings and details so the next lookups hit the API"""
+        with self._meta_lock:
+            self._meta_cache.clear()
 
     def list_agents(self) -> List[Dict]:
         """
@@ -103,20 +311,36 @@ class WatsonxOrchestrateClient:
         Returns:
             List of agent dictionaries
         """
-        try:
-            url = f"{self.instance_url}/v1/agents"
-            response = self.session.get(
-                url,
-                headers=self._get_headers(),
-                timeout=30
-            )
-            response.raise_for_status()
+        self._last_used = time.monotonic()
+        return self._list_agents()
 
-            data = response.json()
-            return data.get("agents", [])
-        except Exception as e:
-            print(f"Error listing agents: {str(e)}")
-            return []
+    def _list_agents(self) -> List[Dict]:
+        cached = self._meta_get("agents")
+        if cached is not None:
+            return cached
+
+        with self._agents_fetch_lock:
+            # Another caller may have fetched the listing while we waited
+            cached = self._meta_get("agents")
+            if cached is not None:
+                return cached
+
+            try:
+                url = self._agents_url
+                response = self.session.get(
+                    url,
+                    timeout=30
+                )
+                response.raise_for_status()
+
+                agents = _json_object(response.content).get("agents", [])
+                if not isinstance(agents, list):
+                    raise ValueError(f"Expected a list of agents, got {type(agents).__name__}")
+                self._meta_set("agents", agents)
+                return agents
+            except _REQUEST_ERRORS as e:
+                logger.error("Error listing agents: %s", e)
+                return []
 
     def get_agent_info(self, agent_id: str) -> Optional[Dict]:
         """
@@ -128,17 +352,24 @@ class WatsonxOrchestrateClient:
         Returns:
             Agent information dictionary or None
         """
+        self._last_used = time.monotonic()
+        cache_key = f"agent:{agent_id}"
+        cached = self._meta_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            url = f"{self.instance_url}/v1/agents/{agent_id}"
+            url = _agent_url(self._agents_url, agent_id)
             response = self.session.get(
                 url,
-                headers=self._get_headers(),
                 timeout=30
             )
             response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"Error getting agent info: {str(e)}")
+            agent_info = _json_object(response.content)
+            self._meta_set(cache_key, agent_info)
+            return agent_info
+        except _REQUEST_ERRORS as e:
+            logger.error("Error getting agent info: %s", e)
             return None
 
     def chat_completion(
@@ -146,20 +377,25 @@ class WatsonxOrchestrateClient:
         agent_id: str,
         messages: List[Dict],
         stream: bool = False
-    ) -> Dict:
+    ) -> Union[Dict, Iterator[Dict]]:
         """
         Send a chat completion request to the agent
 
         Args:
             agent_id: The agent ID to invoke
             messages: List of message dicts with 'role' and 'content'
-            stream: Whether to stream the response (not implemented yet)
+            stream: Whether to stream the response
 
         Returns:
-            Response dictionary from the agent
+            Response dictionary from the agent, or when streaming an iterator of
+            completion chunks whose choices carry a 'delta'
         """
+        self._last_used = time.monotonic()
+        if stream:
+            return self._stream_completion(agent_id, messages)
+
         try:
-            url = f"{self.instance_url}/v1/agents/{agent_id}/chat/completions"
+            url = _chat_url(self._agents_url, agent_id)
 
             payload = {
                 "messages": messages,
@@ -168,24 +404,106 @@ class WatsonxOrchestrateClient:
 
             response = self.session.post(
                 url,
-                headers=self._get_headers(),
-                json=payload,
+                data=_json_dumps(payload),
                 timeout=120  # Financial analysis can take time
             )
             response.raise_for_status()
 
-            return response.json()
+            return _json_object(response.content)
         except requests.exceptions.HTTPError as e:
-            error_msg = f"HTTP Error: {e.response.status_code}"
-            try:
-                error_detail = e.response.json()
-                error_msg += f" - {json.dumps(error_detail)}"
-            except:
-                error_msg += f" - {e.response.text}"
-            return {"error": error_msg}
-        except Exception as e:
+            return {"error": self._http_error_message(e)}
+        except _REQUEST_ERRORS as e:
             return {"error": f"Request failed: {str(e)}"}
 
+    def _stream_completion(self, agent_id: str, messages: List[Dict]) -> Iterator[Dict]:
+        """
+        Stream a chat completion, yielding each SSE chunk as it arrives
+
+        Only one SSE line is held in memory at a time. Failures are yielded as a
+        final {"error": ...} chunk, matching the non-streaming path.
+        """
+        try:
+            url = _chat_url(self._agents_url, agent_id)
+
+            payload = {
+                "messages": messages,
+                "stream": True
+            }
+
+            with self.session.post(
+                url,
+                data=_json_dumps(payload),
+                timeout=120,  # Financial analysis can take time
+                stream=True
+            ) as response:
+                # Describe an HTTP error here: the body can't be read once the response closes
+                try:
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError as e:
+                    yield {"error": self._http_error_message(e)}
+                    return
+
+                # Fall back to the whole body if the server answered without SSE,
+                # wrapped as a single chunk so callers handle one shape
+                if "text/event-stream" not in response.headers.get("Content-Type", ""):
+                    content = self._extract_content(_json_object(response.content))
+                    yield {"choices": [{"delta": {"content": content}}]}
+                    return
+
+                # SSE is always UTF-8; requests would otherwise assume ISO-8859-1 for text/*
+                response.encoding = "utf-8"
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+
+                    yield _json_object(data)
+        except _REQUEST_ERRORS as e:
+            yield {"error": f"Request failed: {str(e)}"}
+
+    @staticmethod
+    def _http_error_message(e: requests.exceptions.HTTPError) -> str:
+        """Describe an HTTP error, including the JSON error body when there is one"""
+        error_msg = f"HTTP Error: {e.response.status_code}"
+        try:
+            error_detail = e.response.json()
+            error_msg += f" - {json.dumps(error_detail)}"
+        except ValueError:
+            error_msg += f" - {e.response.text}"
+        return error_msg
+
+    def chat_completion_batch(
+        self,
+        agent_id: str,
+        messages_list: List[List[Dict]],
+        max_workers: int = 8
+    ) -> List[Dict]:
+        """
+        Send several independent chat completion requests to the agent concurrently
+
+        Args:
+            agent_id: The agent ID to invoke
+            messages_list: One message list per request
+            max_workers: Maximum number of requests in flight at once
+
+        Returns:
+            Response dictionaries in the same order as messages_list
+        """
+        if not messages_list:
+            return []
+
+        # Workers share the session's connection pool, so requests reuse keep-alive connections
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(messages_list)),
+            thread_name_prefix="orchestrate-chat"
+        ) as executor:
+            return list(executor.map(
+                lambda messages: self.chat_completion(agent_id, messages),
+                messages_list
+            ))
+
     def invoke_agent(
         self,
         agent_id: str,
@@ -198,20 +516,52 @@ class WatsonxOrchestrateClient:
         Args:
             agent_id: The agent ID to invoke
             user_message: The user's input message
-            conversation_history: Previous conversation messages
+            conversation_history: Previous conversation messages (not modified)
 
         Returns:
             Agent's response as string
         """
-        messages = conversation_history or []
-        messages.append({"role": "user", "content": user_message})
+        messages = [*(conversation_history or ()), {"role": "user", "content": user_message}]
 
         response = self.chat_completion(agent_id, messages)
 
         if "error" in response:
             return f"❌ Error: {response['error']}"
 
-        # Extract assistant message from response
+        return self._extract_content(response)
+
+    def invoke_agent_stream(
+        self,
+        agent_id: str,
+        user_message: str,
+        conversation_history: Optional[List[Dict]] = None
+    ) -> Iterator[str]:
+        """
+        Invoke the agent and yield its response text as it arrives
+
+        Args:
+            agent_id: The agent ID to invoke
+            user_message: The user's input message
+            conversation_history: Previous conversation messages (not modified)
+
+        Yields:
+            Chunks of the agent's response; errors are yielded as a single message
+        """
+        messages = [*(conversation_history or ()), {"role": "user", "content": user_message}]
+
+        for chunk in self.chat_completion(agent_id, messages, stream=True):
+            if "error" in chunk:
+                yield f"❌ Error: {chunk['error']}"
+                return
+
+            for choice in chunk.get("choices", []):
+                text = (choice.get("delta") or {}).get("content")
+                if text:
+                    yield text
+
+    @staticmethod
+    def _extract_content(response: Dict) -> str:
+        """Extract the assistant message from a chat completion response"""
         if "choices" in response and len(response["choices"]) > 0:
             choice = response["choices"][0]
             if "message" in choice:
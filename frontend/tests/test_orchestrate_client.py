@@ -0,0 +1,112 @@
+"""
+Tests for the streaming chat paths of the Orchestrate client
+Run from frontend/ with: python -m unittest discover tests
+"""
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orchestrate_client import WatsonxOrchestrateClient  # noqa: E402
+
+
+class _OrchestrateHandler(BaseHTTPRequestHandler):
+    """Fake chat completions API; the agent ID picks the reply: sse, json or bad"""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        agent_id = self.path.split("/")[3]
+
+        if agent_id == "sse":
+            chunks = [{"choices": [{"delta": {"content": text}}]} for text in ("Hello", ", wörld")]
+            lines = [f"data: {json.dumps(chunk)}" for chunk in chunks] + ["data: [DONE]"]
+            self._reply(200, "text/event-stream", "\n\n".join(lines).encode("utf-8"))
+        elif agent_id == "json":
+            body = {"choices": [{"message": {"content": "Whole reply"}}]}
+            self._reply(200, "application/json", json.dumps(body).encode())
+        else:
+            self._reply(400, "application/json", json.dumps({"detail": "bad agent"}).encode())
+
+    def _reply(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeOrchestrateTestCase(unittest.TestCase):
+    """Runs a fake Orchestrate server and a client pointed at it"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _OrchestrateHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = WatsonxOrchestrateClient(f"http://127.0.0.1:{self.server.server_address[1]}", "test-key")
+        # Skip IAM: a token that stays valid for the whole test
+        self.client.auth.access_token = "test-token"
+        self.client.auth._token_valid_until = time.monotonic() + 3600
+        self.addCleanup(self.client.close)
+
+
+class StreamingChatTests(_FakeOrchestrateTestCase):
+    def test_sse_chunks_are_yielded_in_order(self):
+        chunks = list(self.client.chat_completion("sse", [], stream=True))
+
+        self.assertEqual([c["choices"][0]["delta"]["content"] for c in chunks], ["Hello", ", wörld"])
+
+    def test_plain_json_reply_is_yielded_as_one_chunk(self):
+        chunks = list(self.client.chat_completion("json", [], stream=True))
+
+        self.assertEqual(chunks, [{"choices": [{"delta": {"content": "Whole reply"}}]}])
+
+    def test_http_error_keeps_the_response_body(self):
+        chunks = list(self.client.chat_completion("bad", [], stream=True))
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0]["error"], 'HTTP Error: 400 - {"detail": "bad agent"}')
+
+    def test_http_error_matches_the_non_streaming_message(self):
+        streamed = list(self.client.chat_completion("bad", [], stream=True))
+
+        self.assertEqual(streamed, [self.client.chat_completion("bad", [])])
+
+
+class InvokeAgentStreamTests(_FakeOrchestrateTestCase):
+    def test_sse_text_is_yielded_as_it_arrives(self):
+        self.assertEqual(list(self.client.invoke_agent_stream("sse", "hi")), ["Hello", ", wörld"])
+
+    def test_plain_json_reply_is_yielded_whole(self):
+        self.assertEqual(list(self.client.invoke_agent_stream("json", "hi")), ["Whole reply"])
+
+    def test_http_error_is_yielded_with_its_detail(self):
+        self.assertEqual(
+            list(self.client.invoke_agent_stream("bad", "hi")),
+            ['❌ Error: HTTP Error: 400 - {"detail": "bad agent"}']
+        )
+
+    def test_history_is_not_modified(self):
+        history = [{"role": "user", "content": "earlier"}]
+
+        list(self.client.invoke_agent_stream("sse", "hi", history))
+
+        self.assertEqual(history, [{"role": "user", "content": "earlier"}])
+
+
+if __name__ == "__main__":
+    unittest.main()